@@ -3,7 +3,8 @@ from django.contrib import admin
 from Quiz.models import Quiz
 
 from .models import (Curriculum, CurriculumEnrollment, CurriculumReview,
-                     CurriculumSyllabi, SyllabiProgress, SyllabiTopic)
+                     CurriculumSyllabi, ReviewClassificationJob,
+                     SyllabiProgress, SyllabiTopic)
 
 
 class CurriculumSyllabiInline(admin.StackedInline):
@@ -55,6 +56,19 @@ class CurriculumReviewAdmin(admin.ModelAdmin):
     ]
 
 
+@admin.register(ReviewClassificationJob)
+class ReviewClassificationJobAdmin(admin.ModelAdmin):
+    list_filter = [
+        "status",
+    ]
+    list_display = [
+        "review",
+        "status",
+        "attempts",
+        "updated_at",
+    ]
+
+
 admin.site.register([
     CurriculumEnrollment,
     SyllabiProgress,
@@ -3,6 +3,7 @@ from rest_framework import serializers
 from Curriculum.models import (Curriculum, CurriculumEnrollment,
                                CurriculumReview, CurriculumSyllabi,
                                SyllabiProgress, SyllabiTopic)
+from Curriculum.progress import set_completed_weeks
 from Quiz.models import QOption, Quiz
 from Resource.models import Resource
 
@@ -10,7 +11,7 @@ from Resource.models import Resource
 class SyllabiTopicSerializer(serializers.ModelSerializer):
     class Meta:
         model = SyllabiTopic
-        exclude = ["resources"]
+        exclude = ["resources", "position"]
 
 
 class ResourceSerializer(serializers.ModelSerializer):
@@ -24,7 +25,7 @@ class SyllabiTopicWithResourcesSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SyllabiTopic
-        exclude = []
+        exclude = ["position"]
 
 
 class CurriculumSyllabiSerializer(serializers.ModelSerializer):
@@ -53,14 +54,18 @@ class SearchQuerySerializer(serializers.Serializer):
 
 
 class CurriculumSerializer(serializers.ModelSerializer):
-    weeks = serializers.SerializerMethodField()
+    weeks = serializers.IntegerField(source="weeks_count", read_only=True)
+    stars = serializers.ListField(
+        source="get_stars", child=serializers.IntegerField(),
+        read_only=True, help_text="Number of reviews of each star, 1 to 5"
+    )
 
     class Meta:
         model = Curriculum
-        exclude = ['resources']
-
-    def get_weeks(self, obj):
-        return obj.curriculumsyllabi_set.all().count()
+        exclude = [
+            'resources', 'weeks_count', 'topic_positions', 'rating_total',
+            'stars_1', 'stars_2', 'stars_3', 'stars_4', 'stars_5'
+        ]
 
 
 class SingleCurriculumSerializer(CurriculumSerializer):
@@ -71,15 +76,17 @@ class EnrolledSingleCurriculumSerializer(CurriculumSerializer):
     syllabus = serializers.SerializerMethodField()
 
     def get_syllabus(self, obj: Curriculum):
-        enrollment = self.context.get("enrollment")
-        syllabus = []
-
-        for syllabi in obj.get_syllabus():
-            completed = SyllabiProgress.objects.filter(
-                enrollment=enrollment, syllabi=syllabi).syllabi_completed()
-            data = CurriculumSyllabiSerializer(instance=syllabi).data
-            data['completed'] = completed
-            syllabus.append(data)
+        completion = self.context.get("syllabus_completion")
+        if completion is None:
+            enrollment = self.context.get("enrollment")
+            completion = enrollment.get_syllabus_completion(
+                obj.get_syllabus()
+            )
+        syllabus = CurriculumSyllabiSerializer(
+            instance=obj.get_syllabus(), many=True).data
+
+        for data in syllabus:
+            data['completed'] = completion.get(data['id'], False)
         return syllabus
 
 
@@ -88,7 +95,10 @@ class CurriculumWithResourcesSerializer(EnrolledSingleCurriculumSerializer):
 
     class Meta:
         model = Curriculum
-        exclude = []
+        exclude = [
+            'weeks_count', 'topic_positions', 'rating_total', 'stars_1',
+            'stars_2', 'stars_3', 'stars_4', 'stars_5'
+        ]
 
 
 class SyllabiProgressSerializer(serializers.ModelSerializer):
@@ -100,6 +110,12 @@ class SyllabiProgressSerializer(serializers.ModelSerializer):
         exclude = ["enrollment"]
 
 
+class TopicProgressSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyllabiProgress
+        exclude = ["enrollment", "syllabi", "topic"]
+
+
 class SyllabiProgressWithoutTopicSerializer(SyllabiProgressSerializer):
     syllabi = CurriculumSyllabiWithoutTOSerializer()
     topic = SyllabiTopicSerializer()
@@ -149,13 +165,22 @@ class CheckEnrolledSerializer(serializers.Serializer):
         return curriculum
 
 
+class CurriculumEnrollmentListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        enrollments = list(data)
+        set_completed_weeks(enrollments)
+        return super().to_representation(enrollments)
+
+
 class CurriculumEnrollmentSerializer(serializers.ModelSerializer):
     completed_weeks = serializers.IntegerField()
     curriculum = CurriculumSerializer()
 
     class Meta:
         model = CurriculumEnrollment
-        exclude = ["user"]
+        exclude = ["user", "completed_bitmap"]
+        list_serializer_class = CurriculumEnrollmentListSerializer
 
 
 class QOptionSerializer(serializers.ModelSerializer):
@@ -215,6 +240,24 @@ class SubmitQuizMarkResponseSerializer(serializers.Serializer):
     remaining_time = serializers.IntegerField(help_text="In seconds")
 
 
+class LeaderboardQuerySerializer(serializers.Serializer):
+    mark = serializers.IntegerField(
+        required=False, min_value=0, max_value=100,
+        help_text="Defaults to the mark of the user"
+    )
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    mark = serializers.FloatField(allow_null=True)
+    total = serializers.IntegerField(help_text="Number of attempts")
+    rank = serializers.IntegerField(allow_null=True)
+    percentile = serializers.FloatField(allow_null=True)
+    histogram = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="Number of attempts of each mark from 0 to 100"
+    )
+
+
 class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -222,6 +265,18 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ["rating", "review"]
 
 
+class CurriculumReviewListSerializer(serializers.ModelSerializer):
+    user = serializers.CharField(
+        source="enrollment.user.username", read_only=True)
+
+    class Meta:
+        model = CurriculumReview
+        fields = [
+            "id", "user", "rating", "review",
+            "sentiment", "label", "created_at"
+        ]
+
+
 class EventSerializer(serializers.Serializer):
     title = serializers.CharField()
     start = serializers.DateTimeField()
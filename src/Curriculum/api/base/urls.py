@@ -45,4 +45,14 @@ urlpatterns = [
         'submit-review/<slug:slug>/',
         views.RateCurriculum.as_view(),
         name='submit-review'),
+    path(
+        'topic/leaderboard/<slug:slug>/', views.TopicLeaderboard.as_view(),
+        name='get-topic-leaderboard'),
+    path(
+        'leaderboard/<slug:slug>/', views.CurriculumLeaderboard.as_view(),
+        name='get-curriculum-leaderboard'),
+    path(
+        'reviews/<slug:slug>/',
+        views.ListCurriculumReviews.as_view(),
+        name='list-curriculum-reviews'),
 ]
@@ -1,34 +1,53 @@
-from typing import Dict
+from typing import Callable, Dict, Optional
 
 from django.conf import settings
-from django.http import HttpResponseBadRequest, HttpResponseNotFound
+from django.http import (Http404, HttpResponseBadRequest,
+                         HttpResponseNotFound)
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
 from rest_framework.response import Response
 
+from Curriculum.cache import (get_curriculum_tree, get_topic_page,
+                              get_topic_quiz)
+from Curriculum.leaderboard import (CURRICULUM, TOPIC, get_curriculum_mark,
+                                    get_histogram, get_standing,
+                                    get_topic_mark, record_mark)
 from Curriculum.models import (Curriculum, CurriculumReview, SyllabiProgress,
                                SyllabiTopic)
-from Quiz.models import QOption, Quiz
+from Curriculum.search import search_curriculums
+from Curriculum.throttle import (count_hit, get_remaining_time, is_throttled,
+                                 set_attempted)
+from Quiz.cache import get_answer_key
 from utils.base.date import dt_now
-from utils.base.ml_loader import ModelLoader
-from utils.base.sentiment import analyze_sentiment
+from utils.base.mixins import KeysetPaginationMixin, StreamingListMixin
+from utils.base.pagination import KeysetPagination
+from utils.base.renderer import EncodedJSON, encode_json
 from utils.base.showwcase import show_get
 
 from . import serializers
 
 
-class CurriculumList(generics.ListAPIView):
+class CurriculumList(
+    StreamingListMixin, KeysetPaginationMixin, generics.ListAPIView
+):
     serializer_class = serializers.CurriculumSerializer
+    keyset_ordering = ("id",)
 
     def get_queryset(self):
         search = self.request.GET.get('search', None)
-        queryset = Curriculum.objects.all()
+        queryset = Curriculum.objects.order_by('id')
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset = search_curriculums(queryset, search)
         return queryset
 
+    def use_keyset_pagination(self):
+        # Search results are ordered by rank, not by a stable key
+        if self.request.GET.get('search', None):
+            return False
+        return super().use_keyset_pagination()
+
     @swagger_auto_schema(
         query_serializer=serializers.SearchQuerySerializer
     )
@@ -37,27 +56,59 @@ class CurriculumList(generics.ListAPIView):
 
 
 class SingleCurriculum(generics.RetrieveAPIView):
+    """
+    Get a curriculum with its syllabus and topics,
+    served from the cached and encoded curriculum tree.
+    """
     serializer_class = serializers.SingleCurriculumSerializer
     lookup_field = 'slug'
 
     def get_queryset(self):
-        return Curriculum.objects.all()
+        return Curriculum.objects.prefetch_related(
+            "curriculumsyllabi_set__syllabitopic_set"
+        )
 
+    def retrieve(self, request, *args, **kwargs):
+        data = get_curriculum_tree(
+            kwargs.get(self.lookup_field),
+            lambda: encode_json(self.get_serializer(self.get_object()).data)
+        )
+        return Response(EncodedJSON(data))
 
-class EnrolledSingleCurriculum(generics.RetrieveAPIView):
-    serializer_class = serializers.EnrolledSingleCurriculumSerializer
+
+class EnrolledCurriculumMixin:
+    """
+    Retrieve a curriculum with its syllabus prefetched, and pass
+    the request user's enrollment to the serializer context.
+    """
     lookup_field = 'slug'
 
+    def get_queryset(self):
+        return Curriculum.objects.prefetch_related(
+            "curriculumsyllabi_set__syllabitopic_set"
+        )
+
+    def get_object(self):
+        if not hasattr(self, "_curriculum"):
+            self._curriculum = super().get_object()
+        return self._curriculum
+
+    def get_enrollment(self):
+        return self.request.user\
+            .get_curriculum_enrollment(self.get_object())
+
     def get_serializer_context(self):
         data = super().get_serializer_context()
         return {
             **data,
-            "enrollment": self.request.user
-            .get_curriculum_enrollment(self.get_object())
+            "enrollment": self.get_enrollment()
         }
 
-    def get_queryset(self):
-        return Curriculum.objects.all()
+
+class EnrolledSingleCurriculum(
+    EnrolledCurriculumMixin, generics.RetrieveAPIView
+):
+    serializer_class = serializers.EnrolledSingleCurriculumSerializer
 
     @swagger_auto_schema(
         responses={
@@ -68,25 +119,50 @@ class EnrolledSingleCurriculum(generics.RetrieveAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class GetEnrolledCurriculums(generics.ListAPIView):
+class GetEnrolledCurriculums(
+    StreamingListMixin, KeysetPaginationMixin, generics.ListAPIView
+):
     serializer_class = serializers.CurriculumEnrollmentSerializer
+    keyset_ordering = ("enrolled_at", "id")
 
     def get_queryset(self):
-        return self.request.user.get_curriculum_enrollments()
+        return self.request.user.get_curriculum_enrollments()\
+            .select_related("curriculum").order_by(*self.keyset_ordering)
 
 
 class GetSyllabiProgress(generics.RetrieveAPIView):
     serializer_class = serializers.SyllabiProgressSerializer
     lookup_field = 'slug'
 
-    def get_object(self):
-        topic = super().get_object()
-        curriculum = topic.syllabi.curriculum
-        enrollment = self.request.user\
-            .get_curriculum_enrollment(curriculum)
-        return SyllabiProgress.objects.get_by_enrollment_topic(
-            enrollment, topic
+    def get_topic_page(self, topic) -> dict:
+        """
+        Build the syllabi and topic of the page shared by every user
+        """
+        return {
+            "syllabi": serializers.CurriculumSyllabiSerializer(
+                topic.syllabi
+            ).data,
+            "topic": serializers.SyllabiTopicWithResourcesSerializer(
+                topic
+            ).data,
+        }
+
+    def retrieve(self, request, *args, **kwargs):
+        page = get_topic_page(
+            self.kwargs.get(self.lookup_field), self.get_topic_page
         )
+        if page is None:
+            raise Http404
+        try:
+            syllabi_progress = SyllabiProgress.objects\
+                .get_or_default_by_user_and_topic_id(
+                    request.user, page["curriculum"], page["topic"]
+                )
+        except SyllabiProgress.DoesNotExist:
+            raise Http404
+
+        data = serializers.TopicProgressSerializer(syllabi_progress).data
+        return Response({**data, **page["data"]})
 
     def get_queryset(self):
         return SyllabiTopic.objects.all()
@@ -123,14 +199,21 @@ class GetTopicQuiz(generics.RetrieveAPIView):
     serializer_class = serializers.TopicQuizSerializer
     lookup_field = "slug"
 
-    def get_quiz_mark(self):
+    def get_quiz_body(self, topic) -> list:
+        """
+        Build the quiz list of a topic shared by every user
+        """
+        quizzes = topic.get_quizzes().prefetch_related("qoption_set")
+        return list(serializers.QuizSerializer(quizzes, many=True).data)
+
+    def get_quiz_mark(self, body):
         """
         Get the mark of the quiz if it exists
         """
         try:
             syllabi_progress: SyllabiProgress = SyllabiProgress.objects\
-                .get_by_user_and_topic(
-                    self.request.user, self.kwargs.get(self.lookup_field)
+                .get_or_default_by_user_and_topic_id(
+                    self.request.user, body["curriculum"], body["topic"]
                 )
         except SyllabiProgress.DoesNotExist:
             return HttpResponseNotFound("Quiz does not exists")
@@ -148,19 +231,21 @@ class GetTopicQuiz(generics.RetrieveAPIView):
         }
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        quiz_mark = self.get_quiz_mark()
+        body = get_topic_quiz(
+            self.kwargs.get(self.lookup_field), self.get_quiz_body
+        )
+        if body is None:
+            raise Http404
+        quiz_mark = self.get_quiz_mark(body)
         if isinstance(quiz_mark, HttpResponseNotFound):
             return quiz_mark
 
-        serializer_class = self.get_serializer_class()
-        serializer = serializer_class(
-            instance, context={
-                "request": request,
-                "quiz_mark": quiz_mark
-            }
-        )
-        return Response(serializer.data)
+        return Response({
+            "quiz": body["quiz"],
+            "mark": quiz_mark["mark"],
+            "remaining_time": quiz_mark["remaining_time"],
+            "completed": quiz_mark["completed"],
+        })
 
     def get_queryset(self):
         return SyllabiTopic.objects.all()
@@ -170,26 +255,42 @@ class SubmitTopicQuiz(generics.GenericAPIView):
     lookup_url_kwarg = "slug"
 
     def validate_request(self):
-        if not self.request.data:
-            return HttpResponseBadRequest
+        data: Dict[str, str] = self.request.data
+        if not data:
+            return HttpResponseBadRequest()
+        if not all(
+            str(quiz_id).isdigit() and str(option_id).isdigit()
+            for quiz_id, option_id in data.items()
+        ):
+            return Response(
+                "Invalid quiz question or option",
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        user = self.request.user
+        topic_slug = self.kwargs.get(self.lookup_url_kwarg)
+        if is_throttled(user.id, topic_slug):
+            return self.retake_not_reached()
 
         try:
+            # The row is only created once the attempt is graded
             syllabi_progress: SyllabiProgress = SyllabiProgress.objects\
-                .get_by_user_and_topic(
-                    self.request.user, self.kwargs.get(self.lookup_url_kwarg)
-                )
+                .get_or_default_by_user_and_topic(user, topic_slug)
         except SyllabiProgress.DoesNotExist:
             return HttpResponseNotFound("Quiz does not exists")
 
-        if syllabi_progress.last_attempted:
-            diff = dt_now() - syllabi_progress.last_attempted
-            print(diff.total_seconds())
-            if (diff.total_seconds() < settings.TEST_INTERVAL_SECONDS):
-                return Response("Time interval for \
-test retake not reached", status=status.HTTP_400_BAD_REQUEST)
+        last_attempted = syllabi_progress.last_attempted
+        if last_attempted and get_remaining_time(last_attempted):
+            count_hit("db")
+            set_attempted(user.id, topic_slug, last_attempted)
+            return self.retake_not_reached()
 
         return syllabi_progress
 
+    def retake_not_reached(self):
+        return Response("Time interval for \
+test retake not reached", status=status.HTTP_400_BAD_REQUEST)
+
     @swagger_auto_schema(
         request_body=serializers.SubmitQuizOptionSerializer(),
         responses={
@@ -205,42 +306,60 @@ test retake not reached", status=status.HTTP_400_BAD_REQUEST)
             return syllabi_progress
 
         data: Dict[str, str] = request.data
-        quizzes = syllabi_progress.topic.get_quizzes()
+        # Grade the whole submission against the answer key of the topic
+        answer_key = get_answer_key(syllabi_progress.topic_id)
+        answers = [
+            (quiz_id, option_id, answer_key.get(int(option_id)))
+            for quiz_id, option_id in data.items()
+        ]
+        if any(
+            answer is None or answer[0] != int(quiz_id)
+            for quiz_id, _, answer in answers
+        ):
+            return Response(
+                "Quiz question or option does not exist",
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         mark = 0
         total = 0
         quiz_response = []
-
-        for quiz_id, option_id in data.items():
-            if (not quiz_id.isdigit()) or (not option_id.isdigit()):
-                return Response(
-                    "Invalid quiz question or option",
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            try:
-                quiz = quizzes.get(id=int(quiz_id))
-                option = quiz.get_options().get(id=int(option_id))
-            except (Quiz.DoesNotExist, QOption.DoesNotExist):
-                return Response(
-                    "Quiz question or option does not exist",
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
-            if option.is_correct:
+        for quiz_id, option_id, (_, is_correct, reason) in answers:
+            if is_correct:
                 mark += 1
             total += 1
             quiz_response.append({
                 quiz_id: {
                     "selected": option_id,
-                    "is_correct": option.is_correct,
-                    "reason": option.reason,
+                    "is_correct": is_correct,
+                    "reason": reason,
                 }
             })
 
+        if syllabi_progress.pk is None:
+            # First attempt, a concurrent one may have created the row
+            syllabi_progress, _ = SyllabiProgress.objects.get_or_create(
+                enrollment=syllabi_progress.enrollment,
+                topic=syllabi_progress.topic,
+                defaults={"syllabi": syllabi_progress.syllabi}
+            )
+
+        previous_mark = None
+        if syllabi_progress.last_attempted:
+            previous_mark = syllabi_progress.quiz_mark
         syllabi_progress.quiz_mark = round((mark / total) * 100, 2)
         syllabi_progress.last_attempted = dt_now()
         syllabi_progress.completed = True
         syllabi_progress.save()
+        set_attempted(
+            request.user.id, kwargs.get(self.lookup_url_kwarg),
+            syllabi_progress.last_attempted
+        )
+        record_mark(
+            syllabi_progress.topic_id, syllabi_progress.enrollment_id,
+            syllabi_progress.enrollment.curriculum_id,
+            previous_mark, syllabi_progress.quiz_mark
+        )
 
         data = {
             "quiz": quiz_response,
@@ -250,20 +369,13 @@ test retake not reached", status=status.HTTP_400_BAD_REQUEST)
         return Response(data)
 
 
-class GetCurriculumWithResources(generics.RetrieveAPIView):
+class GetCurriculumWithResources(
+    EnrolledCurriculumMixin, generics.RetrieveAPIView
+):
     serializer_class = serializers.CurriculumWithResourcesSerializer
-    lookup_field = "slug"
-
-    def get_serializer_context(self):
-        data = super().get_serializer_context()
-        return {
-            **data,
-            "enrollment": self.request.user
-            .get_curriculum_enrollment(self.get_object())
-        }
 
     def get_queryset(self):
-        return Curriculum.objects.all()
+        return super().get_queryset().prefetch_related("resources")
 
     @swagger_auto_schema(
         responses={
@@ -274,12 +386,10 @@ class GetCurriculumWithResources(generics.RetrieveAPIView):
         return super().get(request, *args, **kwargs)
 
 
-class GetEnrolledCurriculumGrades(generics.RetrieveAPIView):
+class GetEnrolledCurriculumGrades(
+    EnrolledCurriculumMixin, generics.RetrieveAPIView
+):
     serializer_class = serializers.SyllabiProgressWithoutTopicSerializer
-    lookup_field = "slug"
-
-    def get_queryset(self):
-        return Curriculum.objects.all()
 
     @swagger_auto_schema(
         responses={
@@ -288,24 +398,27 @@ class GetEnrolledCurriculumGrades(generics.RetrieveAPIView):
     )
     def get(self, request, *args, **kwargs):
         cur = self.get_object()
-        enrollment = self.request.user.get_curriculum_enrollment(
-            cur)
-        syllabus_progress = SyllabiProgress.objects.filter(
-            enrollment=enrollment)
-        responses = []
+        enrollment = self.get_enrollment()
+        syllabus_progress = SyllabiProgress.objects\
+            .get_curriculum_progress(enrollment, cur)
+
+        # A syllabi is completed when every one of its topics is
+        completion = {syllabi.pk: True for syllabi in cur.get_syllabus()}
         for syllabi_progress in syllabus_progress:
-            data = serializers.SyllabiProgressWithoutTopicSerializer(
-                instance=syllabi_progress).data
-            responses.append(data)
+            if not syllabi_progress.completed:
+                completion[syllabi_progress.syllabi_id] = False
 
         cur_serializer = serializers.EnrolledSingleCurriculumSerializer(
-                instance=cur, context={ "enrollment": enrollment })
-        # cur_serializer.context = {
-        #     "enrollment": enrollment
-        # }
+            instance=cur, context={
+                "enrollment": enrollment,
+                "syllabus_completion": completion
+            }
+        )
         data = {
             "curriculum": cur_serializer.data,
-            "progress": responses
+            "progress": serializers.SyllabiProgressWithoutTopicSerializer(
+                syllabus_progress, many=True
+            ).data
         }
         return Response(data)
 
@@ -336,13 +449,8 @@ class RateCurriculum(generics.CreateAPIView):
         cur = self.get_object()
         enrollment = self.request.user\
             .get_curriculum_enrollment(cur)
-        review = serializer.save(enrollment=enrollment)
-
-        # Classify review here, in live app use cron job
-        review.sentiment = CurriculumReview.SENTIMENT_REV_LOOKUP[analyze_sentiment(review.review)]
-        review.label = CurriculumReview.LABEL_REV_LOOKUP[ModelLoader().predict(review.review)]
-        
-        review.save()
+        # Classified in the background by the classify_reviews worker
+        serializer.save(enrollment=enrollment)
 
     @swagger_auto_schema(
         responses={
@@ -354,6 +462,78 @@ class RateCurriculum(generics.CreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
+class LeaderboardMixin:
+    """
+    Rank a quiz mark against the histogram of a topic or curriculum,
+    the mark of the request user is ranked when none is given.
+
+    scope: TOPIC or CURRICULUM
+    scope_model: Model of the ranked topic or curriculum, looked up
+        by slug
+    scope_fields: Fields of the ranked row, its id first
+    user_mark: Called with the request user and the scope fields to
+        get the mark of the user
+    """
+    lookup_field = "slug"
+    scope: str = None
+    scope_model = None
+    scope_fields: tuple = ("pk",)
+    user_mark: Callable[..., Optional[float]] = None
+
+    @swagger_auto_schema(
+        query_serializer=serializers.LeaderboardQuerySerializer,
+        responses={
+            200: serializers.LeaderboardSerializer
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        query = serializers.LeaderboardQuerySerializer(data=request.GET)
+        query.is_valid(raise_exception=True)
+        row = self.scope_model.objects.filter(
+            slug=self.kwargs.get(self.lookup_field)
+        ).values_list(*self.scope_fields).first()
+        if row is None:
+            raise Http404
+
+        mark = query.validated_data.get("mark")
+        if mark is None:
+            mark = self.user_mark(request.user, *row)
+        histogram = get_histogram(self.scope, row[0])
+        return Response({
+            "mark": mark,
+            **get_standing(histogram, mark),
+            "histogram": histogram,
+        })
+
+
+class TopicLeaderboard(LeaderboardMixin, generics.GenericAPIView):
+    scope = TOPIC
+    scope_model = SyllabiTopic
+    scope_fields = ("pk", "syllabi__curriculum")
+    user_mark = staticmethod(get_topic_mark)
+
+
+class CurriculumLeaderboard(LeaderboardMixin, generics.GenericAPIView):
+    scope = CURRICULUM
+    scope_model = Curriculum
+    user_mark = staticmethod(get_curriculum_mark)
+
+
+class ListCurriculumReviews(generics.ListAPIView):
+    """
+    List the reviews of a curriculum, newest first
+    """
+    serializer_class = serializers.CurriculumReviewListSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
+    lookup_field = "slug"
+
+    def get_queryset(self):
+        return CurriculumReview.objects.filter(
+            enrollment__curriculum__slug=self.kwargs.get(self.lookup_field)
+        ).select_related("enrollment__user")
+
+
 class GetUpcomingEvents(generics.ListAPIView):
     serializer_class = serializers.EventSerializer
     permission_classes = []
@@ -0,0 +1,153 @@
+"""
+Cache helpers for the read heavy curriculum endpoints.
+"""
+
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+
+from Quiz.cache import get_quiz_version
+from utils.base.cache import bump_versions, get_version
+
+
+def get_tree_key(slug: str) -> str:
+    return f"curriculum_tree_json_{slug}"
+
+
+def get_curriculum_tree(slug: str, build: Callable[[], Any]) -> Any:
+    """
+    Get the encoded syllabus tree of a curriculum from the cache,
+    `build` is only called to create and store the tree on a miss.
+
+    :param slug: Curriculum slug
+    :type slug: str
+    :param build: Callable returning the encoded tree
+    :type build: Callable[[], Any]
+    :return: Encoded curriculum tree
+    :rtype: Any
+    """
+    key = get_tree_key(slug)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build()
+        cache.set(key, tree, timeout=settings.CURRICULUM_CACHE_TIME)
+    return tree
+
+
+def get_topic_quiz_key(slug: str) -> str:
+    return f"topic_quiz_{slug}"
+
+
+def get_topic_quiz(slug: str, build: Callable[[Any], list]) -> Optional[dict]:
+    """
+    Get the quiz body of a topic, shared by every user, from the cache.
+    The body is stored under the quiz version of the topic, so it is
+    built again by `build` once a quiz, option or the topic changes.
+
+    :param slug: Topic slug
+    :type slug: str
+    :param build: Callable returning the quiz list of the topic
+    :type build: Callable[[SyllabiTopic], list]
+    :return: Topic id, curriculum id and quiz list of the topic,
+        None if the topic does not exist
+    :rtype: Optional[dict]
+    """
+    from Curriculum.models import SyllabiTopic
+
+    key = get_topic_quiz_key(slug)
+    body = cache.get(key)
+    if body is not None and body["version"] == get_quiz_version(
+        body["topic"]
+    ):
+        return body
+
+    topic = SyllabiTopic.objects.select_related("syllabi")\
+        .filter(slug=slug).first()
+    if topic is None:
+        return None
+    # The version is read before the quizzes, a change committed
+    # meanwhile bumps it past the stored body
+    body = {
+        "topic": topic.pk,
+        "curriculum": topic.syllabi.curriculum_id,
+        "version": get_quiz_version(topic.pk),
+    }
+    body["quiz"] = build(topic)
+    cache.set(key, body, timeout=settings.CURRICULUM_CACHE_TIME)
+    return body
+
+
+def get_curriculum_version_key(pk: int) -> str:
+    return f"curriculum_version_{pk}"
+
+
+def get_curriculum_version(pk: int) -> int:
+    return get_version(get_curriculum_version_key(pk))
+
+
+def bump_curriculum_versions(pks: Iterable[int]):
+    """
+    Make the cached topic pages of the curriculums stale once the
+    current transaction commits
+    """
+    bump_versions(get_curriculum_version_key(pk) for pk in pks)
+
+
+def get_topic_page_key(slug: str) -> str:
+    return f"topic_page_{slug}"
+
+
+def get_topic_page(slug: str, build: Callable[[Any], dict]) -> Optional[dict]:
+    """
+    Get the part of a topic page shared by every user from the cache.
+    The page is stored under the version of the curriculum, so it is
+    built again by `build` once the curriculum, its syllabus or the
+    topic resources change.
+
+    :param slug: Topic slug
+    :type slug: str
+    :param build: Callable returning the page of a topic, the syllabi,
+        its topics and the topic resources are prefetched
+    :type build: Callable[[SyllabiTopic], dict]
+    :return: Topic id, curriculum id and page of the topic,
+        None if the topic does not exist
+    :rtype: Optional[dict]
+    """
+    from Curriculum.models import SyllabiTopic
+
+    key = get_topic_page_key(slug)
+    page = cache.get(key)
+    if page is not None and page["version"] == get_curriculum_version(
+        page["curriculum"]
+    ):
+        return page
+
+    topic = SyllabiTopic.objects.select_related("syllabi")\
+        .filter(slug=slug).first()
+    if topic is None:
+        return None
+    page = {
+        "topic": topic.pk,
+        "curriculum": topic.syllabi.curriculum_id,
+        "version": get_curriculum_version(topic.syllabi.curriculum_id),
+    }
+    prefetch_related_objects(
+        [topic], "resources", "syllabi__syllabitopic_set"
+    )
+    page["data"] = build(topic)
+    cache.set(key, page, timeout=settings.CURRICULUM_CACHE_TIME)
+    return page
+
+
+def invalidate_curriculum_trees(slugs: Iterable[str]):
+    """
+    Drop the cached trees of the curriculums once the current
+    transaction commits, so a concurrent read can not store
+    the tree as it was before the change.
+    """
+    keys = [get_tree_key(slug) for slug in slugs if slug]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,91 @@
+"""
+Background classification of curriculum reviews.
+
+A submitted review is saved right away along with a pending job, its
+sentiment and label are filled in later by the `classify_reviews`
+worker, so the NLP models are only ever loaded by the worker. Workers
+claim batches of jobs with `SELECT ... FOR UPDATE SKIP LOCKED` and can
+run side by side.
+"""
+
+from datetime import timedelta
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from utils.base.date import dt_now
+
+# Review text => (Sentiment, label) display names
+Classifier = Callable[[str], Tuple[str, str]]
+
+
+def get_classifier() -> Classifier:
+    from utils.base.ml_loader import ModelLoader
+    from utils.base.sentiment import analyze_sentiment
+
+    loader = ModelLoader()
+
+    def classify(text: str) -> Tuple[str, str]:
+        return analyze_sentiment(text), loader.predict(text)
+
+    return classify
+
+
+def classify_reviews(
+    batch_size: int, classify: Optional[Classifier] = None
+) -> Tuple[int, int]:
+    """
+    Classify the reviews of a batch of due jobs in one transaction.
+    A classified review drops its job, a failed one is retried after
+    `REVIEW_CLASSIFICATION_RETRY_DELAY` seconds, doubled on every
+    attempt, until it used up `REVIEW_CLASSIFICATION_MAX_ATTEMPTS`.
+
+    :param classify: Classifier of the review texts, the NLP models
+        when None
+    :return: Number of classified and failed reviews
+    :rtype: Tuple[int, int]
+    """
+    from Curriculum.models import CurriculumReview, ReviewClassificationJob
+
+    with transaction.atomic():
+        jobs = list(ReviewClassificationJob.objects.claim(batch_size))
+        if not jobs:
+            return 0, 0
+        if classify is None:
+            classify = get_classifier()
+
+        now = dt_now()
+        reviews, failed = [], []
+        for job in jobs:
+            review = job.review
+            try:
+                sentiment, label = classify(review.review)
+                review.sentiment = \
+                    CurriculumReview.SENTIMENT_REV_LOOKUP[sentiment]
+                review.label = CurriculumReview.LABEL_REV_LOOKUP[label]
+            except Exception as e:
+                job.attempts += 1
+                job.error = repr(e)
+                job.next_attempt_at = now + timedelta(
+                    seconds=settings.REVIEW_CLASSIFICATION_RETRY_DELAY
+                    * 2 ** (job.attempts - 1)
+                )
+                job.updated_at = now
+                if job.attempts >= settings.REVIEW_CLASSIFICATION_MAX_ATTEMPTS:
+                    job.status = ReviewClassificationJob.FAILED
+                failed.append(job)
+            else:
+                reviews.append(review)
+
+        # Not an edit of the review, updated_at and the signals are
+        # left alone
+        CurriculumReview.objects.bulk_update(reviews, ["sentiment", "label"])
+        ReviewClassificationJob.objects.filter(
+            review__in=reviews
+        ).delete()
+        # bulk_update leaves auto_now alone, updated_at is set above
+        ReviewClassificationJob.objects.bulk_update(failed, [
+            "attempts", "error", "status", "next_attempt_at", "updated_at"
+        ])
+    return len(reviews), len(failed)
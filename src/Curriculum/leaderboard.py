@@ -0,0 +1,206 @@
+"""
+Quiz mark histograms of topics and curriculums.
+
+Every attempted topic progress counts its last quiz mark in one of the
+0 to 100 buckets of its topic, and every enrollment counts the average
+of its last quiz marks in a bucket of its curriculum, so learners are
+ranked against learners. Buckets are counters in the shared cache moved
+by quiz submissions, a histogram missing from the cache is built again
+from the progress rows in one query, and it expires so any drift is
+corrected from the database.
+"""
+
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Sum
+
+BUCKETS = 101
+
+TOPIC = "topic"
+CURRICULUM = "curriculum"
+
+
+def get_ready_key(scope: str, pk: int) -> str:
+    return f"quiz_histogram_{scope}_{pk}"
+
+
+def get_dirty_key(scope: str, pk: int) -> str:
+    return f"quiz_histogram_{scope}_{pk}_dirty"
+
+
+def get_bucket_key(scope: str, pk: int, bucket: int) -> str:
+    return f"quiz_histogram_{scope}_{pk}_{bucket}"
+
+
+def get_bucket(mark: int) -> int:
+    return min(max(int(mark), 0), BUCKETS - 1)
+
+
+def build_histogram(scope: str, pk: int) -> List[int]:
+    """
+    Count the last quiz marks of the attempted progress rows of a
+    topic, or the average marks of the enrollments of a curriculum
+    """
+    from Curriculum.models import SyllabiProgress
+
+    attempted = SyllabiProgress.objects.filter(
+        last_attempted__isnull=False
+    ).order_by()
+    histogram = [0] * BUCKETS
+    if scope == TOPIC:
+        rows = attempted.filter(topic=pk).values("quiz_mark")\
+            .annotate(total=Count("pk")).values_list("quiz_mark", "total")
+        for mark, total in rows:
+            histogram[get_bucket(mark)] += total
+    else:
+        marks = attempted.filter(enrollment__curriculum=pk)\
+            .values("enrollment").annotate(mark=Avg("quiz_mark"))\
+            .values_list("mark", flat=True)
+        for mark in marks:
+            histogram[get_bucket(mark)] += 1
+    return histogram
+
+
+def get_histogram(scope: str, pk: int) -> List[int]:
+    """
+    Get the histogram of a topic or curriculum from the cache, or
+    from the database when the cache misses
+
+    :param scope: TOPIC or CURRICULUM
+    :type scope: str
+    :param pk: Topic or curriculum id
+    :type pk: int
+    :return: Number of marks in each bucket
+    :rtype: List[int]
+    """
+    ready = get_ready_key(scope, pk)
+    keys = [get_bucket_key(scope, pk, bucket) for bucket in range(BUCKETS)]
+    values = cache.get_many([ready, *keys])
+    if ready in values and len(values) == BUCKETS + 1:
+        return [values[key] for key in keys]
+
+    # Marks moved while building are flagged as dirty, the histogram
+    # is only used for the next reads when nothing moved
+    dirty = get_dirty_key(scope, pk)
+    cache.delete(dirty)
+    histogram = build_histogram(scope, pk)
+    timeout = settings.CURRICULUM_CACHE_TIME
+    cache.set_many(dict(zip(keys, histogram)), timeout=timeout)
+    if cache.get(dirty) is None:
+        cache.add(ready, True, timeout=timeout)
+    return histogram
+
+
+def move_mark(
+    scope: str, pk: int, old: Optional[float], new: Optional[float]
+):
+    ready = get_ready_key(scope, pk)
+    if cache.get(ready) is None:
+        # Built from the database on the next read
+        cache.set(get_dirty_key(scope, pk), True, timeout=60)
+        return
+    try:
+        if old is not None:
+            cache.decr(get_bucket_key(scope, pk, get_bucket(old)))
+        if new is not None:
+            cache.incr(get_bucket_key(scope, pk, get_bucket(new)))
+    except ValueError:
+        # A bucket expired, built again on the next read
+        cache.delete(ready)
+
+
+def get_average_marks(
+    enrollment_id: int, old: Optional[int], new: int
+) -> Tuple[Optional[float], float]:
+    """
+    Get the average mark of an enrollment before and after a topic
+    mark moved from `old` to `new`, read after the new mark is saved
+    """
+    from Curriculum.models import SyllabiProgress
+
+    totals = SyllabiProgress.objects.filter(
+        enrollment=enrollment_id, last_attempted__isnull=False
+    ).aggregate(total=Sum("quiz_mark"), count=Count("pk"))
+    total, count = totals["total"] or 0, totals["count"]
+    before_total = total - new + (old or 0)
+    before_count = count - (old is None)
+    before = before_total / before_count if before_count else None
+    return before, total / count
+
+
+def record_mark(
+    topic_id: int, enrollment_id: int, curriculum_id: int,
+    old: Optional[int], new: int
+):
+    """
+    Move a quiz mark of the topic histogram from the `old` bucket,
+    None for a first attempt, to the `new` one, and the average mark
+    of the enrollment in the curriculum histogram, once the current
+    transaction commits. Must be called after the new mark is saved.
+    """
+    # The stored mark is truncated by the integer column
+    new = int(new)
+    before, after = get_average_marks(enrollment_id, old, new)
+
+    def record():
+        move_mark(TOPIC, topic_id, old, new)
+        move_mark(CURRICULUM, curriculum_id, before, after)
+
+    transaction.on_commit(record)
+
+
+def get_topic_mark(
+    user, topic_id: int, curriculum_id: int
+) -> Optional[float]:
+    """
+    Get the last quiz mark of the user on a topic, None before the
+    first attempt or when the user is not enrolled
+    """
+    from Curriculum.models import SyllabiProgress
+
+    try:
+        progress = SyllabiProgress.objects\
+            .get_or_default_by_user_and_topic_id(
+                user, curriculum_id, topic_id
+            )
+    except SyllabiProgress.DoesNotExist:
+        return None
+    if not progress.last_attempted:
+        return None
+    return progress.quiz_mark
+
+
+def get_curriculum_mark(user, curriculum_id: int) -> Optional[float]:
+    """
+    Get the average last quiz mark of the user on the attempted
+    topics of a curriculum
+    """
+    from Curriculum.models import SyllabiProgress
+
+    return SyllabiProgress.objects.filter(
+        enrollment__user=user, enrollment__curriculum=curriculum_id,
+        last_attempted__isnull=False
+    ).aggregate(mark=Avg("quiz_mark"))["mark"]
+
+
+def get_standing(histogram: List[int], mark: Optional[float]) -> dict:
+    """
+    Get the rank and percentile of a mark from a histogram, the
+    percentile counts half of the equal marks.
+    """
+    total = sum(histogram)
+    if mark is None:
+        return {"total": total, "rank": None, "percentile": None}
+
+    bucket = get_bucket(mark)
+    below = sum(histogram[:bucket])
+    above = total - below - histogram[bucket]
+    percentile = None
+    if total:
+        percentile = round(
+            (below + histogram[bucket] / 2) / total * 100, 2
+        )
+    return {"total": total, "rank": above + 1, "percentile": percentile}
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from Curriculum.models import (Curriculum, CurriculumEnrollment,
+                               CurriculumSyllabi, SyllabiProgress,
+                               SyllabiTopic)
+from Curriculum.progress import rebuild_completion_bitmaps
+from utils.base.counters import counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the weeks, topics and enrolled counters of every "
+        "curriculum, and the topics counters, progress and completion "
+        "bitmap of every enrollment. Run it once the web workers are "
+        "stopped or have flushed their counter buffers, increments they "
+        "still buffer would be counted twice"
+    )
+
+    def count_enrollments(self) -> int:
+        completed = SyllabiProgress.objects.filter(
+            enrollment=OuterRef("pk"), completed=True
+        ).order_by().values("enrollment").annotate(
+            total=Count("pk")
+        ).values("total")
+        topics = SyllabiTopic.objects.filter(
+            syllabi__curriculum=OuterRef("curriculum")
+        ).order_by().values("syllabi__curriculum").annotate(
+            total=Count("pk")
+        ).values("total")
+
+        CurriculumEnrollment.objects.update(
+            completed_topics=Coalesce(Subquery(completed), 0),
+            total_topics=Coalesce(Subquery(topics), 0),
+        )
+        rebuild_completion_bitmaps(CurriculumEnrollment, SyllabiProgress)
+        return CurriculumEnrollment.objects.update(progress=Least(
+            F("completed_topics") * 100 / Greatest(F("total_topics"), 1),
+            100
+        ))
+
+    def handle(self, *args, **options):
+        # Written first so they are not added on top of the recount
+        counters.flush()
+        weeks = CurriculumSyllabi.objects.filter(
+            curriculum=OuterRef("pk")
+        ).order_by().values("curriculum").annotate(
+            total=Count("pk")
+        ).values("total")
+        topics = SyllabiTopic.objects.filter(
+            syllabi__curriculum=OuterRef("pk")
+        ).order_by().values("syllabi__curriculum").annotate(
+            total=Count("pk")
+        ).values("total")
+
+        enrolled = CurriculumEnrollment.objects.filter(
+            curriculum=OuterRef("pk")
+        ).order_by().values("curriculum").annotate(
+            total=Count("pk")
+        ).values("total")
+
+        updated = Curriculum.objects.update(
+            weeks_count=Coalesce(Subquery(weeks), 0),
+            topics_count=Coalesce(Subquery(topics), 0),
+            enrolled=Coalesce(Subquery(enrolled), 0),
+        )
+        enrollments = self.count_enrollments()
+        self.stdout.write(self.style.SUCCESS(
+            f"Recounted {updated} curriculums "
+            f"and {enrollments} enrollments."
+        ))
@@ -0,0 +1,81 @@
+import statistics
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from Curriculum.models import Curriculum, CurriculumSyllabi, SyllabiTopic
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark User.enroll_curriculum latency against the number of "
+        "topics in the curriculum, the data is rolled back when done"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", type=int, nargs="+", default=[10, 50, 200, 1000]
+        )
+        parser.add_argument("--weeks", type=int, default=10)
+        parser.add_argument("--enrollments", type=int, default=20)
+        parser.add_argument(
+            "--eager", action="store_true",
+            help="Create every topic progress row on enrollment"
+        )
+
+    def generate(self, topics: int, weeks: int) -> Curriculum:
+        """
+        Create the curriculum through save(), so the topic positions
+        and counters are set by the signals like in production
+        """
+        curriculum = Curriculum.objects.create(
+            name=f"Bench curriculum {topics}",
+            description="bench", objective="bench",
+            prerequisites="bench", difficulty="B",
+        )
+        syllabus = [
+            CurriculumSyllabi.objects.create(
+                curriculum=curriculum, order=order, title=f"Week {order}",
+                slug=f"bench-{topics}-week-{order}", description="bench",
+            )
+            for order in range(1, weeks + 1)
+        ]
+        for index in range(topics):
+            SyllabiTopic.objects.create(
+                syllabi=syllabus[index % weeks], order=index + 1,
+                title=f"Topic {index}", slug=f"bench-{topics}-topic-{index}",
+                description="bench",
+            )
+        return curriculum
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def handle(self, *args, **options):
+        sparse = not options["eager"]
+        User = get_user_model()
+        with transaction.atomic():
+            users = [
+                User.objects.create_user(
+                    f"bench{index}@example.com", f"bench{index}"
+                )
+                for index in range(options["enrollments"])
+            ]
+            for size in options["sizes"]:
+                curriculum = self.generate(size, options["weeks"])
+                latencies, self.queries = [], 0
+                with connection.execute_wrapper(self.count_query):
+                    for user in users:
+                        start = perf_counter()
+                        user.enroll_curriculum(curriculum, sparse=sparse)
+                        latencies.append((perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f"{size} topics: "
+                    f"mean {statistics.mean(latencies):.2f}ms, "
+                    f"max {max(latencies):.2f}ms, "
+                    f"{self.queries // len(users)} queries per enrollment"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,115 @@
+import random
+import statistics
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Curriculum.models import Curriculum, CurriculumSyllabi, SyllabiTopic
+from Curriculum.search import (build_search_documents, install_search_index,
+                               search_curriculums)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the ranked curriculum search on a generated catalog, "
+        "the catalog is rolled back when done"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--topics", type=int, default=100_000)
+        parser.add_argument("--weeks", type=int, default=10)
+        parser.add_argument("--topics-per-week", type=int, default=10)
+        parser.add_argument("--queries", type=int, default=300)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def words(self, count: int) -> str:
+        return " ".join(random.choices(self.vocabulary, k=count))
+
+    def generate(self, topics: int, weeks: int, per_week: int):
+        """
+        Create the catalog with bulk_create, which skips the signals,
+        so the topic positions and counters are set here as the
+        signals would
+        """
+        curriculums = Curriculum.objects.bulk_create([
+            Curriculum(
+                name=f"{self.words(3)} {index}",
+                slug=f"bench-curriculum-{index}",
+                description=self.words(40),
+                objective=self.words(20),
+                prerequisites=self.words(5),
+                difficulty="B",
+                weeks_count=weeks,
+                topics_count=weeks * per_week,
+                topic_positions=weeks * per_week,
+            )
+            for index in range(max(topics // (weeks * per_week), 1))
+        ], batch_size=500)
+        syllabus = CurriculumSyllabi.objects.bulk_create([
+            CurriculumSyllabi(
+                curriculum=curriculum,
+                order=order,
+                title=self.words(4),
+                slug=f"bench-syllabi-{curriculum.pk}-{order}",
+                description=self.words(25),
+            )
+            for curriculum in curriculums
+            for order in range(1, weeks + 1)
+        ], batch_size=500)
+        SyllabiTopic.objects.bulk_create([
+            SyllabiTopic(
+                syllabi=syllabi,
+                order=order,
+                position=(syllabi.order - 1) * per_week + order - 1,
+                title=self.words(5),
+                slug=f"bench-topic-{syllabi.pk}-{order}",
+                description=self.words(30),
+            )
+            for syllabi in syllabus
+            for order in range(1, per_week + 1)
+        ], batch_size=1000)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        self.vocabulary = [
+            f"{random.choice('bcdfghklmnprstvz')}"
+            f"{random.choice('aeiou')}"
+            f"{random.choice('bcdfghklmnprstvz')}"
+            f"{random.choice('aeiou')}{index}"
+            for index in range(5000)
+        ]
+
+        with transaction.atomic():
+            start = perf_counter()
+            self.generate(
+                options["topics"], options["weeks"],
+                options["topics_per_week"]
+            )
+            install_search_index()
+            build_search_documents()
+            self.stdout.write(
+                f"Generated {SyllabiTopic.objects.count()} topics in "
+                f"{Curriculum.objects.count()} curriculums "
+                f"({perf_counter() - start:.1f}s)"
+            )
+
+            latencies = []
+            for _ in range(options["queries"]):
+                text = self.words(random.choice((1, 2)))
+                start = perf_counter()
+                list(search_curriculums(
+                    Curriculum.objects.all(), text
+                )[:options["page_size"]])
+                latencies.append((perf_counter() - start) * 1000)
+
+            transaction.set_rollback(True)
+
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(latencies)} searches: "
+            f"p50 {percentiles[49]:.2f}ms, "
+            f"p95 {percentiles[94]:.2f}ms, "
+            f"p99 {percentiles[98]:.2f}ms"
+        ))
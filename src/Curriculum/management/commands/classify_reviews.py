@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Curriculum.classification import classify_reviews
+
+
+class Command(BaseCommand):
+    help = (
+        "Classify the sentiment and label of the reviews waiting in the "
+        "classification queue"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=100,
+            help="Reviews classified in one transaction",
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new reviews once the queue is empty",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=5,
+            help="Seconds between polls of an empty queue with --loop",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        classified, failed = 0, 0
+        while True:
+            done, errors = classify_reviews(batch_size)
+            classified += done
+            failed += errors
+            if done or errors:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Classified {classified} reviews, {failed} failed attempts."
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from Curriculum.throttle import get_throttle_hits
+
+
+class Command(BaseCommand):
+    help = "Report the quiz retakes rejected by the retake throttle"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true",
+            help="Reset the counters after reporting them",
+        )
+
+    def handle(self, *args, **options):
+        hits = get_throttle_hits(reset=options["reset"])
+        total = sum(hits.values())
+        for source, count in hits.items():
+            self.stdout.write(f"{source}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(f"Rejected {total} quiz retakes.")
+        )
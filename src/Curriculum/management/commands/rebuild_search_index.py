@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Curriculum.search import build_search_documents, install_search_index
+
+
+class Command(BaseCommand):
+    help = "Install the search index and rebuild every curriculum document"
+
+    def handle(self, *args, **options):
+        install_search_index()
+        indexed = build_search_documents()
+        self.stdout.write(
+            self.style.SUCCESS(f"Indexed {indexed} curriculums.")
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from Curriculum.models import Curriculum, CurriculumReview
+from Curriculum.ratings import recount_ratings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the rating, number of ratings and stars of every "
+        "curriculum from its reviews"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Curriculums recounted in one UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        curriculums = Curriculum.objects.order_by("pk")
+        last, recounted = 0, 0
+        while True:
+            pks = list(curriculums.filter(pk__gt=last).values_list(
+                "pk", flat=True
+            )[:batch_size])
+            if not pks:
+                break
+            recounted += recount_ratings(Curriculum, CurriculumReview, pks)
+            last = pks[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted {recounted} curriculums.")
+        )
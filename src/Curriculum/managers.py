@@ -1,4 +1,13 @@
-from django.db.models import Manager, QuerySet
+from typing import List, Optional
+
+from django.db import transaction
+from django.db.models import F, FilteredRelation, Manager, Q, QuerySet
+from django.db.models.functions import Greatest, Least
+
+from Curriculum.progress import has_bit, set_bit
+from Curriculum.ratings import get_rating_fields
+from Curriculum.signals import enrollment_progress_changed
+from utils.base.date import dt_now
 
 
 class SyllabiProgressQuery(QuerySet):
@@ -21,6 +30,214 @@ class SyllabiProgressManager(Manager):
     def get_by_enrollment_topic(self, enrollment, topic):
         return self.get_queryset().get_by_enrollment_topic(enrollment, topic)
 
+    def get_or_default(self, enrollment, topic):
+        """
+        Get the progress row of the enrollment on a topic, or an unsaved
+        row with the default values when it was not created yet.
+        """
+        try:
+            return self.get_by_enrollment_topic(enrollment, topic)
+        except self.model.DoesNotExist:
+            return self.model(
+                enrollment=enrollment, syllabi=topic.syllabi, topic=topic
+            )
+
+    def get_curriculum_progress(self, enrollment, curriculum) -> List:
+        """
+        Get the progress of the enrollment on every topic of the
+        curriculum in syllabus order, with unsaved default rows for
+        the topics that were not attempted yet.
+
+        The syllabus and topics of `curriculum` are reused for the rows,
+        so they are best prefetched.
+        """
+        progress = {
+            row.topic_id: row for row in self.filter(enrollment=enrollment)
+        }
+        rows = []
+        for syllabi in curriculum.get_syllabus():
+            for topic in syllabi.get_topics():
+                row = progress.get(topic.pk) or \
+                    self.model(enrollment=enrollment)
+                row.syllabi, row.topic = syllabi, topic
+                rows.append(row)
+        return rows
+
     def get_by_user_and_topic(self, user, topic_slug):
-        qset = self.get_queryset()
+        qset = self.get_queryset().select_related("enrollment")
         return qset.get(enrollment__user=user, topic__slug__exact=topic_slug)
+
+    def get_or_default_by_user_and_topic_id(
+        self, user, curriculum_id: int, topic_id: int
+    ):
+        """
+        Get the progress of a user on a topic of a curriculum in a single
+        query, joining the progress row to the enrollment of the user so
+        an unsaved row with the default values is returned when it was
+        not created yet. The returned row is only meant to be read.
+
+        Raise DoesNotExist if the user is not enrolled in the curriculum.
+        """
+        from Curriculum.models import CurriculumEnrollment
+
+        fields = [
+            "id", "completed", "completed_at", "quiz_mark", "last_attempted"
+        ]
+        lookups = {f"topic_progress__{field}": field for field in fields}
+        row = CurriculumEnrollment.objects.filter(
+            user=user, curriculum=curriculum_id
+        ).annotate(topic_progress=FilteredRelation(
+            "syllabiprogress", condition=Q(syllabiprogress__topic=topic_id)
+        )).values("pk", *lookups).first()
+        if row is None:
+            raise self.model.DoesNotExist("Topic progress does not exist")
+
+        progress = self.model(enrollment_id=row["pk"], topic_id=topic_id)
+        if row["topic_progress__id"] is not None:
+            for lookup, field in lookups.items():
+                setattr(progress, field, row[lookup])
+        return progress
+
+    def get_or_default_by_user_and_topic(
+        self, user, topic_slug, create=False
+    ):
+        """
+        Get the progress of a user on a topic. Progress rows are created
+        on the first quiz attempt, so until then an unsaved row with the
+        default values is returned, or created if `create` is set.
+
+        Raise DoesNotExist if the topic does not exist or the user
+        is not enrolled in its curriculum.
+        """
+        try:
+            return self.get_by_user_and_topic(user, topic_slug)
+        except self.model.DoesNotExist:
+            pass
+
+        from Curriculum.models import CurriculumEnrollment, SyllabiTopic
+
+        try:
+            topic = SyllabiTopic.objects.select_related("syllabi")\
+                .get(slug=topic_slug)
+            enrollment = CurriculumEnrollment.objects.get(
+                user=user, curriculum=topic.syllabi.curriculum_id
+            )
+        except (SyllabiTopic.DoesNotExist, CurriculumEnrollment.DoesNotExist):
+            raise self.model.DoesNotExist("Topic progress does not exist")
+
+        if not create:
+            return self.get_or_default(enrollment, topic)
+        progress, _ = self.get_or_create(
+            enrollment=enrollment, topic=topic,
+            defaults={"syllabi": topic.syllabi}
+        )
+        return progress
+
+
+class CurriculumQuery(QuerySet):
+
+    def count_rating(
+        self, old: Optional[int] = None, new: Optional[int] = None
+    ) -> int:
+        """
+        Move a review rating of the curriculums from `old` to `new`,
+        None for a created or deleted review, in one UPDATE so
+        concurrent reviews are not lost.
+        """
+        return self.update(**get_rating_fields(old, new))
+
+
+class CurriculumManager(Manager):
+    def get_queryset(self):
+        return CurriculumQuery(model=self.model, using=self._db)
+
+
+class CurriculumEnrollmentQuery(QuerySet):
+
+    def count_topics(
+        self, completed: int = 0, total: int = 0, **fields
+    ) -> int:
+        """
+        Add to the completed and total topics counters of the
+        enrollments and set their progress from the new values,
+        all in one UPDATE so concurrent changes are not lost.
+        """
+        completed_topics = F("completed_topics") + completed
+        total_topics = F("total_topics") + total
+        updated = self.update(
+            completed_topics=completed_topics,
+            total_topics=total_topics,
+            progress=Least(
+                completed_topics * 100 / Greatest(total_topics, 1), 100
+            ),
+            **fields
+        )
+        if updated and (completed or total):
+            enrollment_progress_changed.send(
+                sender=self.model, enrollments=self
+            )
+        return updated
+
+    def set_topic_completed(self, position: Optional[int], completed: bool):
+        """
+        Count a topic as completed, or not anymore, and set its bit in
+        the completion bitmaps. The rows are locked while the bitmaps
+        are changed, so concurrent submissions keep each other's bits,
+        and an enrollment whose bit already has the value is left
+        alone so stale saves of a progress row are not counted twice.
+        """
+        step = 1 if completed else -1
+        with transaction.atomic():
+            rows = self.select_for_update().values_list(
+                "pk", "completed_bitmap"
+            )
+            for pk, bitmap in rows:
+                fields = {}
+                if position is not None:
+                    if has_bit(bytes(bitmap), position) == completed:
+                        continue
+                    fields["completed_bitmap"] = set_bit(
+                        bytes(bitmap), position, completed
+                    )
+                self.model.objects.filter(pk=pk)\
+                    .count_topics(completed=step, **fields)
+
+
+class CurriculumEnrollmentManager(Manager):
+    def get_queryset(self):
+        return CurriculumEnrollmentQuery(model=self.model, using=self._db)
+
+    def count_topics(self, completed: int = 0, total: int = 0) -> int:
+        return self.get_queryset().count_topics(completed, total)
+
+    def set_topic_completed(self, position: Optional[int], completed: bool):
+        return self.get_queryset().set_topic_completed(position, completed)
+
+
+class ReviewClassificationJobQuery(QuerySet):
+
+    def pending(self):
+        return self.filter(status=self.model.PENDING)
+
+    def claim(self, batch_size: int):
+        """
+        Lock the oldest pending jobs due for an attempt, skipping the
+        jobs locked by other workers, must be evaluated inside a
+        transaction
+        """
+        return self.pending().filter(
+            next_attempt_at__lte=dt_now()
+        ).select_related("review").select_for_update(
+            skip_locked=True, of=("self",)
+        ).order_by("next_attempt_at", "pk")[:batch_size]
+
+
+class ReviewClassificationJobManager(Manager):
+    def get_queryset(self):
+        return ReviewClassificationJobQuery(self.model, using=self._db)
+
+    def pending(self):
+        return self.get_queryset().pending()
+
+    def claim(self, batch_size: int):
+        return self.get_queryset().claim(batch_size)
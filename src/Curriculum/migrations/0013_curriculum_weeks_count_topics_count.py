@@ -0,0 +1,47 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Curriculum = apps.get_model('Curriculum', 'Curriculum')
+    CurriculumSyllabi = apps.get_model('Curriculum', 'CurriculumSyllabi')
+    SyllabiTopic = apps.get_model('Curriculum', 'SyllabiTopic')
+
+    weeks = CurriculumSyllabi.objects.filter(
+        curriculum=OuterRef('pk')
+    ).order_by().values('curriculum').annotate(
+        total=Count('pk')
+    ).values('total')
+    topics = SyllabiTopic.objects.filter(
+        syllabi__curriculum=OuterRef('pk')
+    ).order_by().values('syllabi__curriculum').annotate(
+        total=Count('pk')
+    ).values('total')
+    Curriculum.objects.update(
+        weeks_count=Coalesce(Subquery(weeks), 0),
+        topics_count=Coalesce(Subquery(topics), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0012_alter_curriculumreview_sentiment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculum',
+            name='topics_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='weeks_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from Curriculum.search import (build_search_documents, install_search_index,
+                               uninstall_search_index)
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+def build_documents(apps, schema_editor):
+    build_search_documents(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0013_curriculum_weeks_count_topics_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CurriculumSearch',
+            fields=[
+                ('curriculum', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='Curriculum.curriculum')),
+                ('name', models.TextField()),
+                ('summary', models.TextField()),
+                ('outline', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(install, uninstall),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:18
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Least
+
+
+def backfill_counters(apps, schema_editor):
+    CurriculumEnrollment = apps.get_model(
+        'Curriculum', 'CurriculumEnrollment')
+    SyllabiProgress = apps.get_model('Curriculum', 'SyllabiProgress')
+    SyllabiTopic = apps.get_model('Curriculum', 'SyllabiTopic')
+
+    completed = SyllabiProgress.objects.filter(
+        enrollment=OuterRef('pk'), completed=True
+    ).order_by().values('enrollment').annotate(
+        total=Count('pk')
+    ).values('total')
+    topics = SyllabiTopic.objects.filter(
+        syllabi__curriculum=OuterRef('curriculum')
+    ).order_by().values('syllabi__curriculum').annotate(
+        total=Count('pk')
+    ).values('total')
+    CurriculumEnrollment.objects.update(
+        completed_topics=Coalesce(Subquery(completed), 0),
+        total_topics=Coalesce(Subquery(topics), 0),
+    )
+    CurriculumEnrollment.objects.update(progress=Least(
+        F('completed_topics') * 100 / Greatest(F('total_topics'), 1), 100
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0014_curriculumsearch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculumenrollment',
+            name='completed_topics',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculumenrollment',
+            name='total_topics',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
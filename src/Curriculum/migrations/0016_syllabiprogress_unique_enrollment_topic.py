@@ -0,0 +1,60 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:24
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Least
+
+
+def remove_duplicate_progress(apps, schema_editor):
+    CurriculumEnrollment = apps.get_model(
+        'Curriculum', 'CurriculumEnrollment')
+    SyllabiProgress = apps.get_model('Curriculum', 'SyllabiProgress')
+
+    # Keep the completed, then the latest attempted row of each topic
+    duplicates = SyllabiProgress.objects.order_by().values(
+        'enrollment', 'topic'
+    ).annotate(total=Count('pk')).filter(total__gt=1)
+    enrollments = set()
+    for row in duplicates.iterator():
+        rows = SyllabiProgress.objects.filter(
+            enrollment=row['enrollment'], topic=row['topic']
+        ).order_by(
+            '-completed', F('last_attempted').desc(nulls_last=True), '-pk'
+        )
+        keep = rows.values_list('pk', flat=True).first()
+        rows.exclude(pk=keep).delete()
+        enrollments.add(row['enrollment'])
+    if not enrollments:
+        return
+    if schema_editor.connection.vendor == 'postgresql':
+        # Deferred foreign key checks of the deleted rows would block
+        # the constraint added next in this transaction
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    # The counters backfilled by 0015 counted the removed rows
+    completed = SyllabiProgress.objects.filter(
+        enrollment=OuterRef('pk'), completed=True
+    ).order_by().values('enrollment').annotate(
+        total=Count('pk')
+    ).values('total')
+    changed = CurriculumEnrollment.objects.filter(pk__in=enrollments)
+    changed.update(completed_topics=Coalesce(Subquery(completed), 0))
+    changed.update(progress=Least(
+        F('completed_topics') * 100 / Greatest(F('total_topics'), 1), 100
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0015_curriculumenrollment_topic_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            remove_duplicate_progress, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='syllabiprogress',
+            constraint=models.UniqueConstraint(fields=('enrollment', 'topic'), name='unique_enrollment_topic_progress'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:29
+
+from django.db import migrations, models
+
+from Curriculum.progress import rebuild_completion_bitmaps
+
+
+def backfill_bitmaps(apps, schema_editor):
+    Curriculum = apps.get_model('Curriculum', 'Curriculum')
+    CurriculumEnrollment = apps.get_model(
+        'Curriculum', 'CurriculumEnrollment')
+    SyllabiProgress = apps.get_model('Curriculum', 'SyllabiProgress')
+    SyllabiTopic = apps.get_model('Curriculum', 'SyllabiTopic')
+
+    for curriculum in Curriculum.objects.all():
+        topics = list(SyllabiTopic.objects.filter(
+            syllabi__curriculum=curriculum
+        ).order_by('syllabi__order', 'order', 'pk'))
+        for position, topic in enumerate(topics):
+            topic.position = position
+        SyllabiTopic.objects.bulk_update(
+            topics, ['position'], batch_size=500)
+        Curriculum.objects.filter(pk=curriculum.pk).update(
+            topic_positions=len(topics))
+
+    rebuild_completion_bitmaps(CurriculumEnrollment, SyllabiProgress)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0016_syllabiprogress_unique_enrollment_topic'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculum',
+            name='topic_positions',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculumenrollment',
+            name='completed_bitmap',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='syllabitopic',
+            name='position',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_bitmaps, migrations.RunPython.noop),
+    ]
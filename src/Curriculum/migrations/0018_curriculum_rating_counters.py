@@ -0,0 +1,53 @@
+# Generated by Django 5.1.3 on 2026-10-18 20:57
+
+from django.db import migrations, models
+
+from Curriculum.ratings import recount_ratings
+
+
+def backfill_ratings(apps, schema_editor):
+    recount_ratings(
+        apps.get_model('Curriculum', 'Curriculum'),
+        apps.get_model('Curriculum', 'CurriculumReview'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0017_completion_bitmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculum',
+            name='rating_total',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='stars_1',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='stars_2',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='stars_3',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='stars_4',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='curriculum',
+            name='stars_5',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:04
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrolled(apps, schema_editor):
+    Curriculum = apps.get_model('Curriculum', 'Curriculum')
+    CurriculumEnrollment = apps.get_model(
+        'Curriculum', 'CurriculumEnrollment')
+
+    enrolled = CurriculumEnrollment.objects.filter(
+        curriculum=OuterRef('pk')
+    ).order_by().values('curriculum').annotate(
+        total=Count('pk')
+    ).values('total')
+    Curriculum.objects.update(enrolled=Coalesce(Subquery(enrolled), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0018_curriculum_rating_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_enrolled, migrations.RunPython.noop),
+    ]
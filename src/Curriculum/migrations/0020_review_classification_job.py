@@ -0,0 +1,47 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def enqueue_unclassified_reviews(apps, schema_editor):
+    CurriculumReview = apps.get_model('Curriculum', 'CurriculumReview')
+    ReviewClassificationJob = apps.get_model(
+        'Curriculum', 'ReviewClassificationJob')
+
+    reviews = CurriculumReview.objects.filter(
+        Q(sentiment__isnull=True) | Q(label__isnull=True)
+    ).values_list('pk', flat=True)
+    ReviewClassificationJob.objects.bulk_create(
+        [ReviewClassificationJob(review_id=pk) for pk in reviews],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0019_backfill_curriculum_enrolled'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewClassificationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('F', 'Failed')], default='P', max_length=1)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('review', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='Curriculum.curriculumreview')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='review_job_status_idx')],
+            },
+        ),
+        migrations.RunPython(
+            enqueue_unclassified_reviews, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0020_review_classification_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='curriculum',
+            name='rating',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='curriculum',
+            name='ratings',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:33
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0021_curriculum_rating_not_editable'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='curriculumenrollment',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0022_curriculumenrollment_progress_not_editable'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='curriculum',
+            name='enrolled',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:35
+
+import utils.base.date
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Curriculum', '0023_curriculum_enrolled_not_editable'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reviewclassificationjob',
+            name='review_job_status_idx',
+        ),
+        migrations.AddField(
+            model_name='reviewclassificationjob',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=utils.base.date.dt_now),
+        ),
+        migrations.AddIndex(
+            model_name='reviewclassificationjob',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='review_job_status_idx'),
+        ),
+    ]
@@ -1,17 +1,34 @@
-from functools import reduce
+from typing import Dict, List
 
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
-from django.db.models.signals import pre_save
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
 from django.dispatch import receiver
 
-from Curriculum.managers import SyllabiProgressManager
+from Curriculum.cache import (bump_curriculum_versions,
+                              invalidate_curriculum_trees)
+from Curriculum.managers import (CurriculumEnrollmentManager,
+                                 CurriculumManager,
+                                 ReviewClassificationJobManager,
+                                 SyllabiProgressManager)
+from Curriculum.progress import (get_next_topic_position,
+                                 get_syllabus_completion,
+                                 get_syllabus_positions, has_bit)
+from Curriculum.ratings import STARS, get_star_field
+from Curriculum.search import update_search_documents
+from Quiz.cache import bump_quiz_versions
 from Quiz.models import Quiz
+from Resource.models import Resource
+from utils.base.counters import counters
+from utils.base.date import dt_now
 from utils.base.general import get_unique_slug
+from utils.base.mixins import CounterFieldsModel, ModelChangeFunc
 
 
-class Curriculum(models.Model):
+class Curriculum(CounterFieldsModel):
     """Curriculum Model"""
 
     DIFFICULTY = (
@@ -25,13 +42,41 @@ class Curriculum(models.Model):
     description = models.TextField(null=False, blank=False)
     objective = models.TextField(null=False, blank=False)
     prerequisites = models.TextField(null=False, blank=False)
-    enrolled = models.IntegerField(default=0)
+    # Buffered by the enrollment signals
+    enrolled = models.IntegerField(default=0, editable=False)
     difficulty = models.CharField(
         choices=DIFFICULTY, max_length=1, null=False, blank=False
     )
     resources = models.ManyToManyField("Resource.Resource", blank=True)
-    rating = models.FloatField(default=0.0)
-    ratings = models.IntegerField(default=0)
+    # Maintained by the review signals
+    rating = models.FloatField(default=0.0, editable=False)
+    ratings = models.IntegerField(default=0, editable=False)
+
+    # Maintained by the syllabi and topic signals
+    weeks_count = models.IntegerField(default=0, editable=False)
+    topics_count = models.IntegerField(default=0, editable=False)
+    topic_positions = models.IntegerField(default=0, editable=False)
+
+    # Maintained by the review signals, with rating and ratings
+    rating_total = models.IntegerField(default=0, editable=False)
+    stars_1 = models.IntegerField(default=0, editable=False)
+    stars_2 = models.IntegerField(default=0, editable=False)
+    stars_3 = models.IntegerField(default=0, editable=False)
+    stars_4 = models.IntegerField(default=0, editable=False)
+    stars_5 = models.IntegerField(default=0, editable=False)
+
+    counter_fields = (
+        "enrolled", "weeks_count", "topics_count", "topic_positions",
+        "rating", "ratings", "rating_total", "stars_1", "stars_2",
+        "stars_3", "stars_4", "stars_5",
+    )
+    objects = CurriculumManager()
+
+    def get_stars(self) -> List[int]:
+        """
+        Get the number of reviews of each star, from 1 to 5
+        """
+        return [getattr(self, get_star_field(rating)) for rating in STARS]
 
     def get_syllabus(self) -> models.QuerySet["CurriculumSyllabi"]:
         return self.curriculumsyllabi_set.all()
@@ -55,6 +100,19 @@ class Curriculum(models.Model):
         return self.name
 
 
+class CurriculumSearch(models.Model):
+    """
+    Search document of a curriculum, with the text of its syllabus
+    and topics, indexed by the database full text search.
+    """
+
+    curriculum = models.OneToOneField(
+        Curriculum, on_delete=models.CASCADE, primary_key=True)
+    name = models.TextField()
+    summary = models.TextField()
+    outline = models.TextField()
+
+
 class CurriculumSyllabi(models.Model):
     """Curriculum Syllabi Model"""
 
@@ -99,6 +157,9 @@ class SyllabiTopic(models.Model):
     description = models.TextField(null=False, blank=False)
     resources = models.ManyToManyField("Resource.Resource", blank=True)
 
+    # Bit of the topic in the enrollment completion bitmaps
+    position = models.IntegerField(default=0, editable=False)
+
     def get_quizzes(self) -> models.QuerySet[Quiz]:
         return self.quiz_set.all()
 
@@ -118,36 +179,60 @@ class SyllabiTopic(models.Model):
         ordering = ["order"]
 
 
-class CurriculumEnrollment(models.Model):
+class CurriculumEnrollment(CounterFieldsModel):
     """Curriculum Enrollment Model"""
 
     curriculum = models.ForeignKey(Curriculum, on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # Kept up to date by CurriculumEnrollmentQuery.count_topics
     progress = models.PositiveSmallIntegerField(
-        default=0, validators=[MinValueValidator(0), MaxValueValidator(100)]
+        default=0, editable=False,
+        validators=[MinValueValidator(0), MaxValueValidator(100)]
     )
     completed = models.BooleanField(default=False)
 
-    @property
-    def completed_weeks(self):
-        syllabus = self.curriculum.get_syllabus()
-        progress = SyllabiProgress.objects.filter(enrollment=self)
+    # Kept up to date by CurriculumEnrollmentQuery.count_topics
+    completed_topics = models.IntegerField(default=0, editable=False)
+    total_topics = models.IntegerField(default=0, editable=False)
+    completed_bitmap = models.BinaryField(default=b"", editable=False)
 
-        def count(prev: int, syllabi: CurriculumSyllabi):
-            """
-            Count completed syllabus
-            """
-            is_completed = progress.filter(self, syllabi).syllabi_completed()
-            return prev + 1 if is_completed else prev
+    counter_fields = (
+        "progress", "completed_topics", "total_topics", "completed_bitmap"
+    )
+    objects = CurriculumEnrollmentManager()
+
+    def is_topic_completed(self, topic: SyllabiTopic) -> bool:
+        return has_bit(bytes(self.completed_bitmap), topic.position)
+
+    def get_syllabus_completion(self, syllabus=None) -> Dict[int, bool]:
+        """
+        Get the completion of every syllabi of the curriculum from the
+        completion bitmap. Topic positions are read from `syllabus`
+        when the (prefetched) syllabus is passed, else from the db.
+        """
+        if syllabus is None:
+            positions = get_syllabus_positions(
+                [self.curriculum_id])[self.curriculum_id]
+        else:
+            positions = {
+                syllabi.pk: [topic.position for topic in syllabi.get_topics()]
+                for syllabi in syllabus
+            }
+        return get_syllabus_completion(bytes(self.completed_bitmap), positions)
 
-        return reduce(count, syllabus, 0)
+    @property
+    def completed_weeks(self) -> int:
+        # Set by Curriculum.progress.set_completed_weeks
+        if hasattr(self, "completed_weeks_count"):
+            return self.completed_weeks_count
+        return sum(self.get_syllabus_completion().values())
 
     def __str__(self) -> str:
         return f"{self.user.email} - {self.curriculum.name}"
 
 
-class SyllabiProgress(models.Model):
+class SyllabiProgress(ModelChangeFunc):
     """Curriculum Progress Model"""
 
     enrollment = models.ForeignKey(CurriculumEnrollment, on_delete=models.CASCADE)
@@ -159,6 +244,29 @@ class SyllabiProgress(models.Model):
     last_attempted = models.DateTimeField(null=True)
     objects = SyllabiProgressManager()
 
+    def count_completed(self):
+        CurriculumEnrollment.objects.filter(pk=self.enrollment_id)\
+            .set_topic_completed(self.topic.position, self.completed)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            # A new row is a change from the default, so a row created
+            # already completed is counted too
+            setattr(self, self.get_clone_field("completed"), False)
+        super().save(*args, **kwargs)
+
+    monitor_change = {
+        "completed": count_completed,
+    }
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["enrollment", "topic"],
+                name="unique_enrollment_topic_progress"
+            ),
+        ]
+
 
 class CurriculumReview(models.Model):
     """Curriculum Review Model"""
@@ -191,6 +299,39 @@ class CurriculumReview(models.Model):
     label = models.CharField(max_length=1, choices=LABEL, null=True, blank=True)
 
 
+class ReviewClassificationJob(models.Model):
+    """
+    Pending classification of the sentiment and label of a review,
+    deleted once classified
+    """
+
+    PENDING = "P"
+    FAILED = "F"
+    STATUS = (
+        (PENDING, "Pending"),
+        (FAILED, "Failed"),
+    )
+
+    review = models.OneToOneField(CurriculumReview, on_delete=models.CASCADE)
+    status = models.CharField(max_length=1, choices=STATUS, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    # Failed jobs are retried with an exponential backoff
+    next_attempt_at = models.DateTimeField(default=dt_now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ReviewClassificationJobManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="review_job_status_idx"
+            ),
+        ]
+
+
 @receiver(pre_save, sender=CurriculumSyllabi)
 def set_syllabi_order(sender, instance, **kwargs):
     if not instance.id and instance.order == 0:
@@ -203,12 +344,187 @@ def set_topic_order(sender, instance, **kwargs):
         instance.order = instance.syllabi.get_next_order()
 
 
-@receiver(pre_save, sender=SyllabiProgress)
-def set_enrollment_progress(sender, instance: SyllabiProgress, **kwargs):
-    enrollment = instance.enrollment
-    all_syllabi = SyllabiProgress.objects.filter(enrollment=enrollment)
-    completed_syllabi = all_syllabi.filter(completed=True)
-    enrollment.progress = round(
-        (completed_syllabi.count() / max(all_syllabi.count(), 1)) * 100, 2
+@receiver(pre_save, sender=SyllabiTopic)
+def set_topic_position(sender, instance: SyllabiTopic, **kwargs):
+    if not instance.id:
+        instance.position = get_next_topic_position(
+            instance.syllabi.curriculum_id
+        )
+
+
+def curriculum_changed(curriculums: List[dict]):
+    """
+    Refresh the caches and search documents of changed curriculums
+    """
+    invalidate_curriculum_trees([cur["slug"] for cur in curriculums])
+    update_search_documents([cur["pk"] for cur in curriculums])
+    bump_curriculum_versions([cur["pk"] for cur in curriculums])
+
+
+def get_curriculums(**lookup) -> List[dict]:
+    return list(Curriculum.objects.filter(**lookup).values("pk", "slug"))
+
+
+@receiver([post_save, post_delete], sender=Curriculum)
+def curriculum_saved(sender, instance: Curriculum, **kwargs):
+    curriculum_changed([{"pk": instance.pk, "slug": instance.slug}])
+
+
+@receiver([post_save, post_delete], sender=CurriculumSyllabi)
+def syllabi_saved(sender, instance: CurriculumSyllabi, **kwargs):
+    curriculum_changed(get_curriculums(pk=instance.curriculum_id))
+
+
+@receiver(pre_save, sender=SyllabiTopic)
+def get_previous_syllabi(sender, instance: SyllabiTopic, **kwargs):
+    instance.previous_syllabi_id = None
+    if not instance._state.adding:
+        instance.previous_syllabi_id = SyllabiTopic.objects.filter(
+            pk=instance.pk
+        ).values_list("syllabi", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=SyllabiTopic)
+def topic_saved(sender, instance: SyllabiTopic, **kwargs):
+    # A topic moved to another curriculum leaves the old one changed too
+    syllabus = {instance.syllabi_id, getattr(
+        instance, "previous_syllabi_id", None
+    )}
+    curriculum_changed(get_curriculums(curriculumsyllabi__in=syllabus))
+    bump_quiz_versions([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def quiz_saved(sender, instance: Quiz, **kwargs):
+    curriculums = get_curriculums(
+        curriculumsyllabi__syllabitopic=instance.topic_id
+    )
+    invalidate_curriculum_trees([cur["slug"] for cur in curriculums])
+
+
+def resources_changed(**lookup):
+    """
+    Refresh the cached topic pages of the curriculums using changed
+    topic resources
+    """
+    bump_curriculum_versions(
+        Curriculum.objects.filter(**lookup).values_list("pk", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=SyllabiTopic.resources.through)
+def topic_resources_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        resources_changed(curriculumsyllabi__syllabitopic=instance.pk)
+    elif pk_set:
+        resources_changed(curriculumsyllabi__syllabitopic__in=pk_set)
+    else:
+        resources_changed(
+            curriculumsyllabi__syllabitopic__resources=instance.pk
+        )
+
+
+@receiver([post_save, pre_delete], sender=Resource)
+def resource_saved(sender, instance: Resource, **kwargs):
+    resources_changed(curriculumsyllabi__syllabitopic__resources=instance.pk)
+
+
+@receiver(pre_save, sender=CurriculumReview)
+def get_previous_rating(sender, instance: CurriculumReview, **kwargs):
+    instance.previous_rating = None
+    if not instance._state.adding:
+        instance.previous_rating = CurriculumReview.objects.filter(
+            pk=instance.pk
+        ).values_list("rating", flat=True).first()
+
+
+def review_rated(instance: CurriculumReview, old, new):
+    Curriculum.objects.filter(curriculumenrollment=instance.enrollment_id)\
+        .count_rating(old, new)
+    curriculums = get_curriculums(curriculumenrollment=instance.enrollment_id)
+    invalidate_curriculum_trees([cur["slug"] for cur in curriculums])
+
+
+@receiver(post_save, sender=CurriculumReview)
+def count_review_rating(
+    sender, instance: CurriculumReview, created, **kwargs
+):
+    old = None if created else getattr(instance, "previous_rating", None)
+    if created or old != instance.rating:
+        review_rated(instance, old, instance.rating)
+
+
+@receiver(post_delete, sender=CurriculumReview)
+def uncount_review_rating(sender, instance: CurriculumReview, **kwargs):
+    review_rated(instance, instance.rating, None)
+
+
+@receiver(post_save, sender=CurriculumReview)
+def enqueue_review_classification(
+    sender, instance: CurriculumReview, created, **kwargs
+):
+    if created:
+        ReviewClassificationJob.objects.create(review=instance)
+
+
+def get_count_step(signal, created=False) -> int:
+    if signal is post_delete:
+        return -1
+    return 1 if created else 0
+
+
+@receiver([post_save, post_delete], sender=CurriculumSyllabi)
+def count_curriculum_weeks(sender, instance: CurriculumSyllabi, **kwargs):
+    step = get_count_step(kwargs["signal"], kwargs.get("created", False))
+    if step:
+        Curriculum.objects.filter(pk=instance.curriculum_id)\
+            .update(weeks_count=F("weeks_count") + step)
+
+
+@receiver([post_save, post_delete], sender=SyllabiTopic)
+def count_curriculum_topics(sender, instance: SyllabiTopic, **kwargs):
+    step = get_count_step(kwargs["signal"], kwargs.get("created", False))
+    if step:
+        Curriculum.objects.filter(curriculumsyllabi=instance.syllabi_id)\
+            .update(topics_count=F("topics_count") + step)
+
+
+@receiver([post_save, post_delete], sender=SyllabiTopic)
+def count_enrollment_topics(sender, instance: SyllabiTopic, **kwargs):
+    step = get_count_step(kwargs["signal"], kwargs.get("created", False))
+    if step:
+        CurriculumEnrollment.objects.filter(
+            curriculum__curriculumsyllabi=instance.syllabi_id
+        ).count_topics(total=step)
+
+
+@counters.on_flush(Curriculum)
+def curriculum_counters_flushed(pks: List[int]):
+    invalidate_curriculum_trees(
+        Curriculum.objects.filter(pk__in=pks)
+        .values_list("slug", flat=True)
     )
-    enrollment.save()
+
+
+@receiver([post_save, post_delete], sender=CurriculumEnrollment)
+def count_enrolled(sender, instance: CurriculumEnrollment, **kwargs):
+    step = get_count_step(kwargs["signal"], kwargs.get("created", False))
+    if step:
+        transaction.on_commit(lambda: counters.increment(
+            Curriculum, "enrolled", instance.curriculum_id, step
+        ))
+
+
+@receiver(post_delete, sender=SyllabiProgress)
+def uncount_completed_topic(sender, instance: SyllabiProgress, **kwargs):
+    if instance.completed:
+        # The topic is gone too when deleted with it, its position
+        # is never reused so the bit can be left as it is
+        position = SyllabiTopic.objects.filter(pk=instance.topic_id)\
+            .values_list("position", flat=True).first()
+        CurriculumEnrollment.objects.filter(pk=instance.enrollment_id)\
+            .set_topic_completed(position, False)
@@ -0,0 +1,151 @@
+"""
+Completion bitmaps of curriculum enrollments.
+
+Every topic gets a position in its curriculum when created, positions
+are never reused. The completion bitmap of an enrollment has the bit of
+a topic position set when the topic is completed, so completion can be
+read from one small blob instead of the progress rows.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import F
+
+
+def has_bit(bitmap: bytes, position: int) -> bool:
+    index = position // 8
+    if position < 0 or index >= len(bitmap):
+        return False
+    return bool(bitmap[index] & (1 << (position % 8)))
+
+
+def set_bit(bitmap: bytes, position: int, value: bool = True) -> bytes:
+    """
+    Return a copy of the bitmap with the bit at `position` set or
+    cleared, growing the bitmap as needed.
+    """
+    data = bytearray(bitmap)
+    index = position // 8
+    if index >= len(data):
+        if not value:
+            return bytes(data)
+        data.extend(bytes(index - len(data) + 1))
+    if value:
+        data[index] |= 1 << (position % 8)
+    else:
+        data[index] &= ~(1 << (position % 8)) & 0xFF
+    return bytes(data)
+
+
+def get_next_topic_position(curriculum_id: int) -> int:
+    """
+    Reserve the next topic position of a curriculum. The counter row
+    stays locked by the update until the transaction ends, so
+    concurrent topics get different positions.
+    """
+    from Curriculum.models import Curriculum
+
+    curriculums = Curriculum.objects.filter(pk=curriculum_id)
+    curriculums.update(topic_positions=F("topic_positions") + 1)
+    return curriculums.values_list("topic_positions", flat=True).get() - 1
+
+
+def get_syllabus_positions(
+    curriculum_ids: Iterable[int]
+) -> Dict[int, Dict[int, List[int]]]:
+    """
+    Get the topic positions of every syllabi of the curriculums
+    in a single query.
+
+    :return: Curriculum id => syllabi id => topic positions
+    :rtype: Dict[int, Dict[int, List[int]]]
+    """
+    from Curriculum.models import CurriculumSyllabi
+
+    rows = CurriculumSyllabi.objects.filter(
+        curriculum__in=curriculum_ids
+    ).order_by("order", "pk").values_list(
+        "curriculum", "pk", "syllabitopic__position"
+    )
+    positions = defaultdict(dict)
+    for curriculum, syllabi, position in rows:
+        topics = positions[curriculum].setdefault(syllabi, [])
+        if position is not None:
+            topics.append(position)
+    return positions
+
+
+def get_syllabus_completion(
+    bitmap: bytes, syllabus: Dict[int, List[int]]
+) -> Dict[int, bool]:
+    """
+    A syllabi is completed when the bits of all of its topics are set
+
+    :param syllabus: Syllabi id => topic positions
+    :return: Syllabi id => completed
+    """
+    return {
+        syllabi: all(has_bit(bitmap, position) for position in positions)
+        for syllabi, positions in syllabus.items()
+    }
+
+
+def set_completed_weeks(enrollments: Iterable) -> None:
+    """
+    Set `completed_weeks_count` on every enrollment, reading the
+    syllabus of all their curriculums in a single query.
+    """
+    positions = get_syllabus_positions(
+        {enrollment.curriculum_id for enrollment in enrollments}
+    )
+    for enrollment in enrollments:
+        completion = get_syllabus_completion(
+            bytes(enrollment.completed_bitmap),
+            positions[enrollment.curriculum_id]
+        )
+        enrollment.completed_weeks_count = sum(completion.values())
+
+
+def rebuild_completion_bitmaps(
+    enrollment_model, progress_model, chunk_size: int = 500
+) -> int:
+    """
+    Rebuild the completion bitmap of every enrollment from its
+    completed progress rows, models are passed in to be usable
+    from migrations. Enrollments are rebuilt in chunks locked like
+    `set_topic_completed` does, so submissions saved meanwhile keep
+    their bits.
+
+    :return: Number of enrollments whose bitmap changed
+    """
+    rebuilt, last_pk = 0, 0
+    while True:
+        with transaction.atomic():
+            enrollments = list(
+                enrollment_model.objects.filter(pk__gt=last_pk)
+                .select_for_update().order_by("pk")
+                .only("pk", "completed_bitmap")[:chunk_size]
+            )
+            if not enrollments:
+                return rebuilt
+
+            bitmaps = defaultdict(bytes)
+            rows = progress_model.objects.filter(
+                enrollment__in=enrollments, completed=True
+            ).values_list("enrollment", "topic__position")
+            for enrollment, position in rows:
+                bitmaps[enrollment] = set_bit(bitmaps[enrollment], position)
+
+            changed = []
+            for enrollment in enrollments:
+                bitmap = bitmaps[enrollment.pk]
+                if bytes(enrollment.completed_bitmap) != bitmap:
+                    enrollment.completed_bitmap = bitmap
+                    changed.append(enrollment)
+            enrollment_model.objects.bulk_update(
+                changed, ["completed_bitmap"]
+            )
+        rebuilt += len(changed)
+        last_pk = enrollments[-1].pk
@@ -0,0 +1,78 @@
+"""
+Review ratings of curriculums.
+
+Curriculums keep the number, total and mean of the ratings of their
+reviews and the number of reviews for each star, changed with F
+expression updates as reviews are created, changed and deleted.
+"""
+
+from typing import Iterable, Optional
+
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+STARS = range(1, 6)
+
+
+def get_star_field(rating: int) -> str:
+    return f"stars_{rating}"
+
+
+def get_rating_fields(
+    old: Optional[int] = None, new: Optional[int] = None
+) -> dict:
+    """
+    Get the update of the rating counters of a curriculum moving a
+    review rating from `old` to `new`, None for a created or deleted
+    review. The mean is computed from the new total and count in the
+    same UPDATE.
+    """
+    step = (new is not None) - (old is not None)
+    ratings = F("ratings") + step
+    rating_total = F("rating_total") + (new or 0) - (old or 0)
+    fields = {
+        "ratings": ratings,
+        "rating_total": rating_total,
+        "rating": Cast(rating_total, FloatField()) / Greatest(ratings, 1),
+    }
+    for rating, delta in ((old, -1), (new, 1)):
+        if rating in STARS:
+            field = get_star_field(rating)
+            fields[field] = fields.get(field, F(field)) + delta
+    return fields
+
+
+def recount_ratings(
+    curriculum_model, review_model, pks: Optional[Iterable[int]] = None
+) -> int:
+    """
+    Recount the rating counters of the curriculums from their reviews
+    in one UPDATE, models are passed in to be usable from migrations.
+
+    :param pks: Curriculum ids, every curriculum when None
+    :return: Number of recounted curriculums
+    :rtype: int
+    """
+    def aggregate(expression):
+        return Coalesce(Subquery(review_model.objects.filter(
+            enrollment__curriculum=OuterRef("pk")
+        ).order_by().values("enrollment__curriculum").annotate(
+            total=expression
+        ).values("total")), 0)
+
+    curriculums = curriculum_model.objects.all()
+    if pks is not None:
+        curriculums = curriculums.filter(pk__in=pks)
+    curriculums.update(
+        ratings=aggregate(Count("pk")),
+        rating_total=aggregate(Sum("rating")),
+        **{
+            get_star_field(rating): aggregate(
+                Count("pk", filter=Q(rating=rating))
+            )
+            for rating in STARS
+        }
+    )
+    return curriculums.update(rating=Cast(
+        F("rating_total"), FloatField()
+    ) / Greatest(F("ratings"), 1))
@@ -0,0 +1,290 @@
+"""
+Ranked full text search over the curriculum search documents.
+
+Postgres ranks a weighted tsvector column together with the trigram
+similarity of the name, SQLite ranks a FTS5 table with bm25. Both
+indexes are created by `install_search_index`, other databases fall
+back to a case insensitive scan.
+"""
+
+import re
+import threading
+from typing import Iterable, List, Set
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(outline, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS curriculum_search_vector_idx
+    ON {table} USING GIN (search_vector)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS curriculum_search_name_trgm_idx
+    ON {table} USING GIN (name gin_trgm_ops)
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS curriculum_search_name_trgm_idx",
+    "DROP INDEX IF EXISTS curriculum_search_vector_idx",
+    "ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector",
+]
+
+POSTGRES_SEARCH = """
+    SELECT curriculum_id
+    FROM {table}, websearch_to_tsquery('english', %s) query
+    WHERE search_vector @@ query OR name %% %s
+    ORDER BY ts_rank(search_vector, query) + similarity(name, %s) DESC
+    LIMIT %s
+"""
+
+# The FTS5 table is kept in sync with the document table by triggers,
+# its rowid is the curriculum id.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS {fts}
+    USING fts5(name, summary, outline, tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts_name}_insert AFTER INSERT ON {table}
+    BEGIN
+        INSERT INTO {fts}(rowid, name, summary, outline)
+        VALUES (new.curriculum_id, new.name, new.summary, new.outline);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts_name}_delete AFTER DELETE ON {table}
+    BEGIN
+        DELETE FROM {fts} WHERE rowid = old.curriculum_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS {fts_name}_update AFTER UPDATE ON {table}
+    BEGIN
+        DELETE FROM {fts} WHERE rowid = old.curriculum_id;
+        INSERT INTO {fts}(rowid, name, summary, outline)
+        VALUES (new.curriculum_id, new.name, new.summary, new.outline);
+    END
+    """,
+    """
+    INSERT INTO {fts}(rowid, name, summary, outline)
+    SELECT curriculum_id, name, summary, outline FROM {table}
+    WHERE curriculum_id NOT IN (SELECT rowid FROM {fts})
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS {fts_name}_insert",
+    "DROP TRIGGER IF EXISTS {fts_name}_delete",
+    "DROP TRIGGER IF EXISTS {fts_name}_update",
+    "DROP TABLE IF EXISTS {fts}",
+]
+
+# bm25 weights of the name, summary and outline columns
+SQLITE_SEARCH = """
+    SELECT rowid FROM {fts}
+    WHERE {fts} MATCH %s
+    ORDER BY bm25({fts}, 10.0, 4.0, 1.0)
+    LIMIT %s
+"""
+
+WORD_RE = re.compile(r"\w+")
+
+# Curriculum ids waiting for a rebuild, connections are per thread
+_pending = threading.local()
+
+
+def get_table_names(conn) -> dict:
+    from Curriculum.models import CurriculumSearch
+
+    table = CurriculumSearch._meta.db_table
+    return {
+        "table": conn.ops.quote_name(table),
+        "fts": conn.ops.quote_name(f"{table}_fts"),
+        "fts_name": f"{table}_fts",
+    }
+
+
+def run_statements(conn, statements: Iterable[str]):
+    names = get_table_names(conn)
+    with conn.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement.format(**names))
+
+
+def install_search_index(conn=connection):
+    """
+    Create the full text search index of the database vendor,
+    it is safe to run more than once.
+    """
+    if conn.vendor == "postgresql":
+        run_statements(conn, POSTGRES_INSTALL)
+    elif conn.vendor == "sqlite":
+        run_statements(conn, SQLITE_INSTALL)
+
+
+def uninstall_search_index(conn=connection):
+    if conn.vendor == "postgresql":
+        run_statements(conn, POSTGRES_UNINSTALL)
+    elif conn.vendor == "sqlite":
+        run_statements(conn, SQLITE_UNINSTALL)
+
+
+def get_fts_query(text: str) -> str:
+    """
+    Quote every word of the user text as a FTS5 prefix query,
+    so FTS5 operators in the text are matched literally.
+    """
+    return " ".join(f'"{word}"*' for word in WORD_RE.findall(text))
+
+
+def get_ranked_ids(text: str, limit: int) -> List[int]:
+    names = get_table_names(connection)
+    if connection.vendor == "postgresql":
+        sql = POSTGRES_SEARCH.format(**names)
+        params = [text, text, text, limit]
+    else:
+        query = get_fts_query(text)
+        if not query:
+            return []
+        sql = SQLITE_SEARCH.format(**names)
+        params = [query, limit]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_curriculums(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Filter `queryset` to the curriculums matching `text`,
+    ordered from the most relevant.
+
+    :param queryset: Curriculum queryset
+    :type queryset: QuerySet
+    :param text: Search text
+    :type text: str
+    :return: Ranked curriculum queryset
+    :rtype: QuerySet
+    """
+    if connection.vendor not in ("postgresql", "sqlite"):
+        return queryset.filter(
+            Q(curriculumsearch__name__icontains=text)
+            | Q(curriculumsearch__summary__icontains=text)
+            | Q(curriculumsearch__outline__icontains=text)
+        )
+
+    ids = get_ranked_ids(text, settings.CURRICULUM_SEARCH_LIMIT)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(pk__in=ids).order_by(get_rank(queryset, ids))
+
+
+def get_rank(queryset: QuerySet, ids: List[int]) -> RawSQL:
+    """
+    Position of the row id in the ranked `ids`, passed as a single
+    parameter so long result lists stay cheap to compile and sort.
+    """
+    quote = connection.ops.quote_name
+    column = f"{quote(queryset.model._meta.db_table)}.{quote('id')}"
+    if connection.vendor == "postgresql":
+        return RawSQL(f"array_position(%s::bigint[], {column})", (ids,))
+    positions = ",".join(str(pk) for pk in ids)
+    return RawSQL(f"instr(%s, ',' || {column} || ',')", (f",{positions},",))
+
+
+def build_search_documents(
+    curriculum_ids: Iterable[int] = None, apps=global_apps
+) -> int:
+    """
+    Rebuild the search documents of the curriculums, every one
+    when `curriculum_ids` is None. Deleted curriculums are skipped.
+
+    :param apps: App registry to get the models from, the historical
+        one when run from a migration
+    :return: Number of documents written
+    :rtype: int
+    """
+    Curriculum = apps.get_model("Curriculum", "Curriculum")
+    CurriculumSearch = apps.get_model("Curriculum", "CurriculumSearch")
+    CurriculumSyllabi = apps.get_model("Curriculum", "CurriculumSyllabi")
+    SyllabiTopic = apps.get_model("Curriculum", "SyllabiTopic")
+
+    curriculums = Curriculum.objects.order_by()
+    syllabus = CurriculumSyllabi.objects.order_by("order", "id")
+    topics = SyllabiTopic.objects.order_by("order", "id")
+    if curriculum_ids is not None:
+        curriculum_ids = list(curriculum_ids)
+        curriculums = curriculums.filter(pk__in=curriculum_ids)
+        syllabus = syllabus.filter(curriculum__in=curriculum_ids)
+        topics = topics.filter(syllabi__curriculum__in=curriculum_ids)
+
+    outlines = {}
+    for syllabi in syllabus.values("curriculum", "title", "description"):
+        outlines.setdefault(syllabi["curriculum"], []).extend(
+            [syllabi["title"], syllabi["description"]]
+        )
+    for topic in topics.values("syllabi__curriculum", "title", "description"):
+        outlines.setdefault(topic["syllabi__curriculum"], []).extend(
+            [topic["title"], topic["description"]]
+        )
+
+    documents = [
+        CurriculumSearch(
+            curriculum_id=curriculum["id"],
+            name=curriculum["name"],
+            summary=f"{curriculum['description']}\n{curriculum['objective']}",
+            outline="\n".join(outlines.get(curriculum["id"], [])),
+        )
+        for curriculum in curriculums.values(
+            "id", "name", "description", "objective"
+        )
+    ]
+
+    with transaction.atomic():
+        stale = CurriculumSearch.objects.all()
+        if curriculum_ids is not None:
+            stale = stale.filter(curriculum__in=curriculum_ids)
+        stale.delete()
+        CurriculumSearch.objects.bulk_create(documents, batch_size=500)
+    return len(documents)
+
+
+def get_pending_ids() -> Set[int]:
+    if not hasattr(_pending, "ids"):
+        _pending.ids = set()
+    return _pending.ids
+
+
+def build_pending_documents() -> int:
+    ids = get_pending_ids()
+    if not ids:
+        return 0
+    _pending.ids = set()
+    return build_search_documents(sorted(ids))
+
+
+def update_search_documents(curriculum_ids: Iterable[int]):
+    """
+    Rebuild the search documents once the current transaction
+    commits, after cascading deletes have finished. The first
+    callback of a transaction rebuilds every curriculum changed in
+    it, so bulk changes rebuild each document once.
+    """
+    curriculum_ids = {pk for pk in curriculum_ids if pk}
+    if curriculum_ids:
+        get_pending_ids().update(curriculum_ids)
+        transaction.on_commit(build_pending_documents)
@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent with the `enrollments` queryset whose progress was just updated
+enrollment_progress_changed = Signal()
@@ -0,0 +1,85 @@
+"""
+Retake throttle of quiz submissions.
+
+A graded submission stores its time under the user and topic in the
+shared cache until the retake interval ends, so early retakes are
+rejected before reading the progress row. The progress row stays the
+source of truth when the cache misses.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils.base.date import dt_now
+
+# Where a rejected retake was found
+HIT_SOURCES = ("cache", "db")
+
+
+def get_retake_key(user_id: int, topic_slug: str) -> str:
+    return f"quiz_retake_{user_id}_{topic_slug}"
+
+
+def get_hits_key(source: str) -> str:
+    return f"quiz_retake_hits_{source}"
+
+
+def get_remaining_time(last_attempted: datetime) -> float:
+    """
+    Seconds left before the quiz can be retaken
+    """
+    elapsed = (dt_now() - last_attempted).total_seconds()
+    return max(settings.TEST_INTERVAL_SECONDS - elapsed, 0)
+
+
+def set_attempted(user_id: int, topic_slug: str, last_attempted: datetime):
+    """
+    Keep the attempt in the cache for the rest of the retake interval
+    """
+    remaining = get_remaining_time(last_attempted)
+    if remaining:
+        cache.set(
+            get_retake_key(user_id, topic_slug), last_attempted,
+            timeout=math.ceil(remaining)
+        )
+
+
+def is_throttled(user_id: int, topic_slug: str) -> bool:
+    """
+    Check the cached attempt of the user on the topic, a miss does not
+    mean the retake is allowed, the progress row must be checked.
+    """
+    last_attempted = cache.get(get_retake_key(user_id, topic_slug))
+    if last_attempted is None or not get_remaining_time(last_attempted):
+        return False
+    count_hit("cache")
+    return True
+
+
+def count_hit(source: str):
+    key = get_hits_key(source)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def get_throttle_hits(reset: bool = False) -> Dict[str, int]:
+    """
+    Get the rejected retakes found in the cache and in the database
+
+    :param reset: Start counting again from zero
+    :type reset: bool
+    :return: Source => rejected retakes
+    :rtype: Dict[str, int]
+    """
+    keys = {get_hits_key(source): source for source in HIT_SOURCES}
+    hits = cache.get_many(keys)
+    if reset:
+        cache.delete_many(keys)
+    return {source: hits.get(key, 0) for key, source in keys.items()}
@@ -0,0 +1,76 @@
+"""
+Cache of the quiz answer keys used to grade submissions.
+
+Every topic has a version in the shared cache which is bumped when one
+of its quizzes or options changes. Answer keys are stored under the
+topic version in the shared cache and in a bounded LRU of each worker,
+so grading only reads the version while the quizzes stay the same.
+"""
+
+import threading
+from typing import Iterable
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.core.cache import cache
+
+from Quiz.managers import AnswerKey
+from utils.base.cache import bump_versions, get_version
+
+# Topic id => (version, answer key)
+_answer_keys = LRUCache(maxsize=settings.QUIZ_ANSWER_KEY_LRU_SIZE)
+_lock = threading.Lock()
+
+
+def get_version_key(topic_id: int) -> str:
+    return f"quiz_version_{topic_id}"
+
+
+def get_answer_key_key(topic_id: int, version: int) -> str:
+    return f"quiz_answer_key_{topic_id}_{version}"
+
+
+def get_quiz_version(topic_id: int) -> int:
+    return get_version(get_version_key(topic_id))
+
+
+def get_answer_key(topic_id: int) -> AnswerKey:
+    """
+    Get the answer key of a topic from the worker LRU or the shared
+    cache, the options are only queried when both miss.
+
+    :param topic_id: Syllabi topic id
+    :type topic_id: int
+    :return: Option id => (quiz id, is correct, reason)
+    :rtype: AnswerKey
+    """
+    from Quiz.models import QOption
+
+    version = get_quiz_version(topic_id)
+    with _lock:
+        cached = _answer_keys.get(topic_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    key = get_answer_key_key(topic_id, version)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = QOption.objects.get_answer_key(topic_id)
+        cache.set(key, answer_key, timeout=settings.CURRICULUM_CACHE_TIME)
+    with _lock:
+        _answer_keys[topic_id] = (version, answer_key)
+    return answer_key
+
+
+def bump_quiz_versions(topic_ids: Iterable[int]):
+    """
+    Bump the quiz versions of the topics once the current transaction
+    commits, answer keys stored under the old versions are never
+    read again.
+    """
+    bump_versions(get_version_key(topic_id) for topic_id in topic_ids)
+
+
+def clear_answer_keys():
+    with _lock:
+        _answer_keys.clear()
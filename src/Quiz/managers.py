@@ -0,0 +1,27 @@
+from typing import Dict, Tuple
+
+from django.db.models import Manager, QuerySet
+
+# Option id => (quiz id, is correct, reason)
+AnswerKey = Dict[int, Tuple[int, bool, str]]
+
+
+class QOptionQuery(QuerySet):
+
+    def answer_key(self) -> AnswerKey:
+        """
+        Get the answer key of the options in a single query
+        """
+        rows = self.values_list("id", "quiz_id", "is_correct", "reason")
+        return {
+            option: (quiz, is_correct, reason)
+            for option, quiz, is_correct, reason in rows
+        }
+
+
+class QOptionManager(Manager):
+    def get_queryset(self):
+        return QOptionQuery(model=self.model, using=self._db)
+
+    def get_answer_key(self, topic_id: int) -> AnswerKey:
+        return self.get_queryset().filter(quiz__topic=topic_id).answer_key()
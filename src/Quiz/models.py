@@ -1,4 +1,9 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Quiz.cache import bump_quiz_versions
+from Quiz.managers import QOptionManager
 
 
 class Quiz(models.Model):
@@ -21,3 +26,18 @@ class QOption(models.Model):
     option = models.CharField(max_length=255, null=False, blank=False)
     reason = models.TextField(null=True, blank=True)
     is_correct = models.BooleanField(default=False)
+    objects = QOptionManager()
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def quiz_changed(sender, instance: Quiz, **kwargs):
+    bump_quiz_versions([instance.topic_id])
+
+
+@receiver([post_save, post_delete], sender=QOption)
+def option_changed(sender, instance: QOption, **kwargs):
+    bump_quiz_versions(
+        Quiz.objects.filter(pk=instance.quiz_id).values_list(
+            "topic_id", flat=True
+        )
+    )
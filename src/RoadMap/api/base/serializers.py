@@ -0,0 +1,78 @@
+from rest_framework import serializers
+
+from Curriculum.models import Curriculum
+from RoadMap.models import JobRole, Roadmap, RoadmapCurriculum
+
+
+class JobRoleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobRole
+        exclude = []
+
+
+class CurriculumSummarySerializer(serializers.ModelSerializer):
+    weeks = serializers.IntegerField(source="weeks_count", read_only=True)
+
+    class Meta:
+        model = Curriculum
+        fields = [
+            "id", "name", "slug", "difficulty", "weeks", "topics_count",
+            "enrolled", "rating", "ratings"
+        ]
+
+
+class RoadmapCurriculumSerializer(serializers.ModelSerializer):
+    curriculum = CurriculumSummarySerializer()
+
+    class Meta:
+        model = RoadmapCurriculum
+        fields = ["id", "order", "curriculum"]
+
+
+class RoadmapSerializer(serializers.ModelSerializer):
+    job_role = JobRoleSerializer()
+
+    class Meta:
+        model = Roadmap
+        fields = ["id", "job_role"]
+
+
+class RoadmapStatsSerializer(serializers.Serializer):
+    required = serializers.IntegerField()
+    electives = serializers.IntegerField()
+    weeks = serializers.IntegerField()
+    topics = serializers.IntegerField()
+
+
+class RoadmapGraphSerializer(RoadmapSerializer):
+    required = serializers.SerializerMethodField()
+    electives = serializers.SerializerMethodField()
+    stats = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Roadmap
+        fields = ["id", "job_role", "required", "electives", "stats"]
+
+    def get_curriculums(self, obj: Roadmap, rtype: str):
+        return [
+            item for item in obj.get_curriculums() if item.rtype == rtype
+        ]
+
+    def get_required(self, obj: Roadmap):
+        return RoadmapCurriculumSerializer(
+            self.get_curriculums(obj, "R"), many=True
+        ).data
+
+    def get_electives(self, obj: Roadmap):
+        return RoadmapCurriculumSerializer(
+            self.get_curriculums(obj, "E"), many=True
+        ).data
+
+    def get_stats(self, obj: Roadmap):
+        required = self.get_curriculums(obj, "R")
+        return RoadmapStatsSerializer({
+            "required": len(required),
+            "electives": len(self.get_curriculums(obj, "E")),
+            "weeks": sum(item.curriculum.weeks_count for item in required),
+            "topics": sum(item.curriculum.topics_count for item in required),
+        }).data
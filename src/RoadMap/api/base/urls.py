@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'roadmap'
+urlpatterns = [
+    path('', views.RoadmapList.as_view(), name='list-roadmap'),
+    path(
+        '<int:pk>/', views.SingleRoadmap.as_view(),
+        name='get-roadmap'),
+]
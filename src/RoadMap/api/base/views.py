@@ -0,0 +1,41 @@
+from django.db.models import Prefetch
+from rest_framework import generics
+from rest_framework.response import Response
+
+from RoadMap.cache import get_roadmap_graph
+from RoadMap.models import Roadmap, RoadmapCurriculum
+from utils.base.renderer import EncodedJSON, encode_json
+
+from . import serializers
+
+
+class RoadmapList(generics.ListAPIView):
+    serializer_class = serializers.RoadmapSerializer
+
+    def get_queryset(self):
+        return Roadmap.objects.select_related("job_role").order_by("id")
+
+
+class SingleRoadmap(generics.RetrieveAPIView):
+    """
+    Get a roadmap with its ordered required and elective curriculums,
+    served from the cached and encoded roadmap graph.
+    """
+    serializer_class = serializers.RoadmapGraphSerializer
+
+    def get_queryset(self):
+        return Roadmap.objects.select_related("job_role").prefetch_related(
+            Prefetch(
+                "roadmapcurriculum_set",
+                queryset=RoadmapCurriculum.objects.select_related(
+                    "curriculum"
+                )
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        data = get_roadmap_graph(
+            kwargs.get(self.lookup_field),
+            lambda: encode_json(self.get_serializer(self.get_object()).data)
+        )
+        return Response(EncodedJSON(data))
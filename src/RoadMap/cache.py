@@ -0,0 +1,44 @@
+"""
+Cache of the precomputed roadmap graphs.
+"""
+
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_graph_key(pk: int) -> str:
+    return f"roadmap_graph_json_{pk}"
+
+
+def get_roadmap_graph(pk: int, build: Callable[[], Any]) -> Any:
+    """
+    Get the encoded graph of a roadmap from the cache,
+    `build` is only called to create and store the graph on a miss.
+
+    :param pk: Roadmap id
+    :type pk: int
+    :param build: Callable returning the encoded graph
+    :type build: Callable[[], Any]
+    :return: Encoded roadmap graph
+    :rtype: Any
+    """
+    key = get_graph_key(pk)
+    graph = cache.get(key)
+    if graph is None:
+        graph = build()
+        cache.set(key, graph, timeout=settings.ROADMAP_CACHE_TIME)
+    return graph
+
+
+def invalidate_roadmap_graphs(pks: Iterable[int]):
+    """
+    Drop the cached graphs of the roadmaps once the current
+    transaction commits, so a concurrent read can not store
+    the graph as it was before the change.
+    """
+    keys = [get_graph_key(pk) for pk in set(pks)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from RoadMap.models import RoadmapEnrollment
+from RoadMap.progress import update_roadmap_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the progress of every roadmap enrollment"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Roadmap enrollments recomputed at a time",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        enrollments = RoadmapEnrollment.objects.order_by("pk")
+        last, changed = 0, 0
+        while True:
+            pks = list(enrollments.filter(pk__gt=last).values_list(
+                "pk", flat=True
+            )[:batch_size])
+            if not pks:
+                break
+            changed += update_roadmap_progress(
+                RoadmapEnrollment.objects.filter(pk__in=pks)
+            )
+            last = pks[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated {changed} roadmap enrollments.")
+        )
@@ -1,6 +1,14 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Curriculum.models import Curriculum, CurriculumEnrollment
+from Curriculum.signals import enrollment_progress_changed
+from RoadMap.cache import invalidate_roadmap_graphs
+from RoadMap.progress import update_roadmap_progress
 
 
 class JobRole(models.Model):
@@ -27,6 +35,9 @@ class Roadmap(models.Model):
     job_role = models.ForeignKey(
         JobRole, on_delete=models.DO_NOTHING, null=True)
 
+    def get_curriculums(self) -> models.QuerySet["RoadmapCurriculum"]:
+        return self.roadmapcurriculum_set.all()
+
     def __str__(self) -> str:
         if self.job_role:
             return f"Roadmap for {self.job_role.name}"
@@ -69,3 +80,70 @@ class RoadmapEnrollment(models.Model):
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(100)]
     )
+
+
+def get_roadmaps(**lookup):
+    return Roadmap.objects.filter(**lookup).values_list("pk", flat=True)
+
+
+@receiver([post_save, post_delete], sender=JobRole)
+def job_role_saved(sender, instance: JobRole, **kwargs):
+    invalidate_roadmap_graphs(get_roadmaps(job_role=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Roadmap)
+def roadmap_saved(sender, instance: Roadmap, **kwargs):
+    invalidate_roadmap_graphs([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=RoadmapCurriculum)
+def roadmap_curriculum_saved(sender, instance: RoadmapCurriculum, **kwargs):
+    invalidate_roadmap_graphs([instance.roadmap_id])
+    update_roadmap_progress(
+        RoadmapEnrollment.objects.filter(roadmap=instance.roadmap_id)
+    )
+
+
+@receiver(post_save, sender=Curriculum)
+def curriculum_saved(sender, instance: Curriculum, **kwargs):
+    invalidate_roadmap_graphs(
+        get_roadmaps(roadmapcurriculum__curriculum=instance.pk)
+    )
+
+
+@receiver(post_save, sender=RoadmapEnrollment)
+def roadmap_enrolled(sender, instance: RoadmapEnrollment, created, **kwargs):
+    if created:
+        update_roadmap_progress(
+            RoadmapEnrollment.objects.filter(pk=instance.pk)
+        )
+
+
+@receiver(enrollment_progress_changed)
+def rollup_roadmap_progress(sender, enrollments, **kwargs):
+    """
+    Recompute the roadmap enrollments of the users on the roadmaps
+    containing the curriculums of the changed enrollments
+    """
+    update_roadmap_progress(RoadmapEnrollment.objects.filter(Exists(
+        enrollments.filter(
+            user=OuterRef("user"),
+            curriculum__roadmapcurriculum__roadmap=OuterRef("roadmap")
+        )
+    )))
+
+
+@receiver(post_delete, sender=CurriculumEnrollment)
+def curriculum_unenrolled(
+    sender, instance: CurriculumEnrollment, **kwargs
+):
+    """
+    Recompute the roadmap enrollments of the user on the roadmaps
+    containing the curriculum, the deleted enrollment counts as no
+    progress
+    """
+    update_roadmap_progress(RoadmapEnrollment.objects.filter(
+        user=instance.user_id, roadmap__in=RoadmapCurriculum.objects.filter(
+            curriculum=instance.curriculum_id
+        ).values("roadmap")
+    ))
@@ -0,0 +1,93 @@
+"""
+Progress of roadmap enrollments.
+
+The progress of a roadmap enrollment is the average progress of the
+user on the curriculums of the roadmap, weighted by the curriculum
+type. It is rolled up from the curriculum enrollments, never from the
+topic progress rows.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+
+def get_weighted_progress(items: Iterable[Tuple[str, int]]) -> int:
+    """
+    Get the progress of a roadmap from the type and progress of each
+    of its curriculums
+
+    :param items: (Curriculum type, progress) of the curriculums
+    :return: Progress from 0 to 100
+    :rtype: int
+    """
+    weights = settings.ROADMAP_PROGRESS_WEIGHTS
+    total = 0
+    weighted = 0
+    for rtype, progress in items:
+        weight = weights.get(rtype, 0)
+        total += weight
+        weighted += weight * progress
+    if not total:
+        return 0
+    return min(weighted // total, 100)
+
+
+def update_roadmap_progress(enrollments) -> int:
+    """
+    Recompute the progress of the roadmap enrollments, reading their
+    roadmaps and the curriculum enrollments of their users in a fixed
+    number of queries. The roadmap enrollments are locked first, so
+    concurrent updates of one user wait for each other instead of
+    writing back stale progress.
+
+    :param enrollments: Roadmap enrollments queryset
+    :return: Number of enrollments whose progress changed
+    :rtype: int
+    """
+    from Curriculum.models import CurriculumEnrollment
+    from RoadMap.models import RoadmapCurriculum, RoadmapEnrollment
+
+    with transaction.atomic():
+        enrollments = list(
+            enrollments.select_for_update(of=("self",)).order_by("pk")
+            .only("roadmap", "user", "progress")
+        )
+        if not enrollments:
+            return 0
+
+        roadmaps = defaultdict(list)
+        rows = RoadmapCurriculum.objects.filter(roadmap__in={
+            enrollment.roadmap_id for enrollment in enrollments
+        }).values_list("roadmap", "curriculum", "rtype")
+        for roadmap, curriculum, rtype in rows:
+            roadmaps[roadmap].append((curriculum, rtype))
+
+        progress = {
+            (user, curriculum): value
+            for user, curriculum, value in
+            CurriculumEnrollment.objects.filter(
+                user__in={enrollment.user_id for enrollment in enrollments},
+                curriculum__in={
+                    curriculum for items in roadmaps.values()
+                    for curriculum, _ in items
+                }
+            ).values_list("user", "curriculum", "progress")
+        }
+
+        changed = []
+        for enrollment in enrollments:
+            value = get_weighted_progress(
+                (rtype, progress.get((enrollment.user_id, curriculum), 0))
+                for curriculum, rtype in roadmaps[enrollment.roadmap_id]
+            )
+            if value != enrollment.progress:
+                enrollment.progress = value
+                changed.append(enrollment)
+
+        RoadmapEnrollment.objects.bulk_update(
+            changed, ["progress"], batch_size=500
+        )
+    return len(changed)
@@ -1,4 +1,6 @@
 
+from typing import Optional
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.core.cache import cache
@@ -6,7 +8,8 @@ from django.db import models, transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
-from Curriculum.models import Curriculum, CurriculumEnrollment
+from Curriculum.models import (Curriculum, CurriculumEnrollment,
+                               SyllabiProgress, SyllabiTopic)
 from utils.base.general import random_otp, send_email
 from utils.base.validators import validate_special_char
 
@@ -120,17 +123,36 @@ must not contain special characters"
         return True
 
     @transaction.atomic
-    def enroll_curriculum(self, curriculum: Curriculum):
+    def enroll_curriculum(
+        self, curriculum: Curriculum, sparse: Optional[bool] = None
+    ):
+        """
+        Enroll the user in a curriculum, `sparse` overrides the
+        CURRICULUM_SPARSE_PROGRESS setting
+        """
+        if sparse is None:
+            sparse = settings.CURRICULUM_SPARSE_PROGRESS
+        topics = SyllabiTopic.objects.filter(syllabi__curriculum=curriculum)
+        if sparse:
+            # Progress rows are created on the first quiz attempt
+            return self.curriculumenrollment_set.create(
+                curriculum=curriculum,
+                total_topics=topics.count(),
+            )
+
+        topics = list(topics.values_list("id", "syllabi_id"))
         enrollment = self.curriculumenrollment_set.create(
             curriculum=curriculum,
+            total_topics=len(topics),
         )
-
-        for syllabi in curriculum.syllabus:
-            for topic in syllabi.get_topics():
-                enrollment.syllabiprogress_set.create(
-                    syllabi=syllabi,
-                    topic=topic
-                )
+        SyllabiProgress.objects.bulk_create([
+            SyllabiProgress(
+                enrollment=enrollment,
+                syllabi_id=syllabi_id,
+                topic_id=topic_id
+            )
+            for topic_id, syllabi_id in topics
+        ])
 
         return enrollment
 
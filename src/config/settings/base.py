@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'Quiz',
     'Resource',
     'RoadMap',
+    'utils',
 ]
 
 REST_FRAMEWORK = {
@@ -245,3 +246,26 @@ TEST_INTERVAL_SECONDS = 10 # 1 * 24 * 60 * 60
 SHOWWCASE_API_KEY = config("SHOWWCASE_API_KEY")
 SHOWWCASE_BASE_URL = "https://cache.showwcase.com"
 SHOWWCASE_API_CACHE_TIME = 60 * 60 * 2  # 2 hours
+
+CURRICULUM_CACHE_TIME = 60 * 60 * 24  # 1 day
+# Curriculum counters in roadmap graphs are refreshed on expiry
+ROADMAP_CACHE_TIME = 60 * 60  # 1 hour
+# Buffered counter increments are written every few seconds, or once
+# this many rows have pending increments
+COUNTER_FLUSH_INTERVAL = 5  # seconds
+COUNTER_MAX_PENDING = 500
+
+# Weight of required and elective curriculums in roadmap progress
+ROADMAP_PROGRESS_WEIGHTS = {"R": 2, "E": 1}
+# Attempts of the classify_reviews worker before a review is given up
+REVIEW_CLASSIFICATION_MAX_ATTEMPTS = 3
+# Seconds before a failed review is retried, doubled on every attempt
+REVIEW_CLASSIFICATION_RETRY_DELAY = 60
+CURRICULUM_SEARCH_LIMIT = 1000
+
+# Answer keys of the most graded topics kept in each worker
+QUIZ_ANSWER_KEY_LRU_SIZE = 1024
+
+# Create topic progress rows on the first quiz attempt instead of
+# one row per topic on enrollment
+CURRICULUM_SPARSE_PROGRESS = True
@@ -32,3 +32,6 @@ if TEST_DB_USER:
 
 # use default loc mem cache for tests
 CACHES['default']["BACKEND"] = 'django.core.cache.backends.locmem.LocMemCache'
+
+# Write counter increments right away
+COUNTER_FLUSH_INTERVAL = 0
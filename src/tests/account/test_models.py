@@ -1,5 +1,7 @@
 import pytest
 
+from Curriculum.models import SyllabiTopic
+
 
 @pytest.mark.django_db
 class TestUserModel:
@@ -20,3 +22,39 @@ class TestUserModel:
 
     def test_str(self, user):
         assert str(user) == user.username
+
+    @pytest.mark.usefixtures("eager_progress")
+    def test_enroll_curriculum(self, user, make_curriculum):
+        curriculum = make_curriculum(weeks=2, topics=3, quizzes=0)
+        enrollment = user.enroll_curriculum(curriculum)
+
+        assert enrollment.total_topics == 6
+        assert sorted(enrollment.syllabiprogress_set.values_list(
+            "topic", "syllabi"
+        )) == sorted(SyllabiTopic.objects.filter(
+            syllabi__curriculum=curriculum
+        ).values_list("id", "syllabi"))
+
+    @pytest.mark.usefixtures("eager_progress")
+    def test_enroll_queries_constant(
+        self, user, make_curriculum, django_assert_num_queries
+    ):
+        small = make_curriculum(weeks=1, topics=1, quizzes=0)
+        large = make_curriculum(weeks=4, topics=10, quizzes=0)
+
+        # Topics lookup, enrollment insert and progress bulk insert,
+        # within the savepoint of the transaction
+        with django_assert_num_queries(5):
+            user.enroll_curriculum(small)
+        with django_assert_num_queries(5):
+            user.enroll_curriculum(large)
+
+    def test_enroll_curriculum_sparse(
+        self, user, make_curriculum, django_assert_num_queries
+    ):
+        curriculum = make_curriculum(weeks=2, topics=3, quizzes=0)
+        with django_assert_num_queries(4):
+            enrollment = user.enroll_curriculum(curriculum)
+
+        assert enrollment.total_topics == 6
+        assert not enrollment.syllabiprogress_set.exists()
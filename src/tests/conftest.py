@@ -4,10 +4,16 @@ from unittest import TestCase
 
 import pytest
 from django.contrib.admin import AdminSite
+from django.core.cache import cache
 from django.core.files.base import File
+from django.urls import reverse
 from model_bakery import baker
 from PIL import Image
 from rest_framework.test import APIClient
+
+from Curriculum.models import Curriculum, CurriculumSyllabi, SyllabiTopic
+from Quiz.cache import clear_answer_keys
+from Quiz.models import QOption, Quiz
 from utils.base.constants import User
 from utils.base.general import get_tokens_for_user
 
@@ -218,6 +224,16 @@ def use_dummy_media_path(settings, tmp_path):
     settings.MEDIA_ROOT = settings.BASE_DIR / tmp_path
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Primary keys are reused between tests, so cached entries
+    must not leak from one test to the next
+    """
+    cache.clear()
+    clear_answer_keys()
+
+
 @pytest.fixture
 def image_file(
     name='test.png', ext='png', size=(50, 50)
@@ -227,3 +243,69 @@ def image_file(
     image.save(file_obj, ext)
     file_obj.seek(0)
     return File(file_obj, name=name)
+
+
+@pytest.fixture
+def make_curriculum():
+
+    def inner(weeks=2, topics=3, quizzes=2, options=3):
+        curriculum = baker.make(Curriculum, difficulty="B")
+        for _ in range(weeks):
+            syllabi = baker.make(CurriculumSyllabi, curriculum=curriculum)
+            for _ in range(topics):
+                topic = baker.make(SyllabiTopic, syllabi=syllabi)
+                for _ in range(quizzes):
+                    quiz = baker.make(Quiz, topic=topic)
+                    for index in range(options):
+                        baker.make(QOption, quiz=quiz, is_correct=index == 0)
+        return curriculum
+
+    return inner
+
+
+@pytest.fixture
+def curriculum(make_curriculum):
+    return make_curriculum()
+
+
+@pytest.fixture
+def eager_progress(settings):
+    """Create every topic progress row on enrollment"""
+    settings.CURRICULUM_SPARSE_PROGRESS = False
+
+
+def get_answers(topic) -> dict:
+    """Correct answers of every quiz of a topic"""
+    return {
+        str(quiz.id): str(quiz.get_options().get(is_correct=True).id)
+        for quiz in topic.get_quizzes()
+    }
+
+
+@pytest.fixture
+def enrolled_topic(user, curriculum):
+    """First topic of `curriculum`, with `user` enrolled"""
+    user.enroll_curriculum(curriculum)
+    return curriculum.syllabus.first().topics.first()
+
+
+@pytest.fixture
+def submit_quiz(logged_post):
+    """
+    Submit the answers of a topic quiz, the correct ones by default or
+    with the first quiz answered wrong when not `correct`
+    """
+
+    def inner(user, topic, answers=None, correct=True):
+        if answers is None:
+            answers = get_answers(topic)
+        if not correct:
+            quiz = topic.get_quizzes().first()
+            answers[str(quiz.id)] = str(
+                quiz.get_options().filter(is_correct=False).first().id
+            )
+        return logged_post(user, reverse(
+            "curriculum:submit-syllabi-topic-quiz", args=[topic.slug]
+        ), answers)
+
+    return inner
@@ -0,0 +1,291 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum.cache import get_tree_key
+from Quiz.cache import clear_answer_keys, get_answer_key, get_quiz_version
+from Quiz.models import QOption
+from Resource.models import Resource
+
+
+@pytest.mark.django_db
+class TestCurriculumTreeCache:
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def url(self, curriculum):
+        return reverse(
+            "curriculum:get-curriculum", kwargs={"slug": curriculum.slug}
+        )
+
+    def test_tree_is_cached(
+        self, user, curriculum, logged_get, django_assert_num_queries
+    ):
+        response = logged_get(user, self.url(curriculum))
+        assert response.status_code == 200
+        assert cache.get(get_tree_key(curriculum.slug)) is not None
+
+        # Only the user lookup of the permission class is left
+        with django_assert_num_queries(1):
+            cached = logged_get(user, self.url(curriculum))
+        assert cached.json() == response.json()
+
+    def test_tree_syllabus(self, user, curriculum, logged_get):
+        data = logged_get(user, self.url(curriculum)).json()["data"]
+        assert data["weeks"] == 2
+        assert len(data["syllabus"]) == 2
+        assert len(data["syllabus"][0]["topics"]) == 3
+        assert len(data["syllabus"][0]["outlines"]) == 3
+
+    def test_topic_change_invalidates_tree(
+        self, user, curriculum, logged_get,
+        django_capture_on_commit_callbacks
+    ):
+        logged_get(user, self.url(curriculum))
+        topic = curriculum.syllabus.first().topics.first()
+        with django_capture_on_commit_callbacks(execute=True):
+            topic.title = "Changed title"
+            topic.save()
+        assert cache.get(get_tree_key(curriculum.slug)) is None
+
+        data = logged_get(user, self.url(curriculum)).json()["data"]
+        assert "Changed title" in data["syllabus"][0]["outlines"]
+
+    def test_enrollment_invalidates_tree(
+        self, user, curriculum, logged_get,
+        django_capture_on_commit_callbacks
+    ):
+        logged_get(user, self.url(curriculum))
+        with django_capture_on_commit_callbacks(execute=True):
+            user.enroll_curriculum(curriculum)
+        assert cache.get(get_tree_key(curriculum.slug)) is None
+
+        data = logged_get(user, self.url(curriculum)).json()["data"]
+        assert data["enrolled"] == 1
+
+    def test_missing_curriculum(self, user, logged_get):
+        response = logged_get(
+            user, reverse("curriculum:get-curriculum", args=["missing"])
+        )
+        assert response.status_code == 404
+        assert cache.get(get_tree_key("missing")) is None
+
+
+@pytest.mark.django_db
+class TestAnswerKeyCache:
+
+    @pytest.fixture
+    def topic(self, curriculum):
+        return curriculum.syllabus.first().topics.first()
+
+    def count_option_queries(self, topic) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            get_answer_key(topic.id)
+        table = QOption._meta.db_table
+        return sum(table in query["sql"] for query in queries)
+
+    def test_answer_key(self, topic):
+        answer_key = get_answer_key(topic.id)
+        options = QOption.objects.filter(quiz__topic=topic)
+        assert set(answer_key) == {option.id for option in options}
+        for option in options:
+            assert answer_key[option.id] == (
+                option.quiz_id, option.is_correct, option.reason
+            )
+
+    def test_cached_answer_key(self, topic):
+        assert self.count_option_queries(topic) == 1
+        assert self.count_option_queries(topic) == 0
+
+        # Another worker reads the answer key from the shared cache
+        clear_answer_keys()
+        assert self.count_option_queries(topic) == 0
+
+    @pytest.mark.parametrize("change", [
+        lambda option: option.save(),
+        lambda option: option.delete(),
+        lambda option: option.quiz.save(),
+    ])
+    def test_change_bumps_version(
+        self, topic, change, django_capture_on_commit_callbacks
+    ):
+        get_answer_key(topic.id)
+        version = get_quiz_version(topic.id)
+        option = QOption.objects.filter(quiz__topic=topic).first()
+        option.is_correct = not option.is_correct
+
+        with django_capture_on_commit_callbacks(execute=True):
+            change(option)
+        assert get_quiz_version(topic.id) == version + 1
+        assert self.count_option_queries(topic) == 1
+        assert get_answer_key(topic.id) == QOption.objects.get_answer_key(
+            topic.id
+        )
+
+    def test_other_topic_keeps_version(
+        self, curriculum, topic, django_capture_on_commit_callbacks
+    ):
+        other = curriculum.syllabus.last().topics.first()
+        version = get_quiz_version(other.id)
+        with django_capture_on_commit_callbacks(execute=True):
+            QOption.objects.filter(quiz__topic=topic).first().save()
+        assert get_quiz_version(other.id) == version
+
+
+@pytest.mark.django_db
+class TestTopicQuizCache:
+
+    def get(self, user, topic, logged_get):
+        return logged_get(user, reverse(
+            "curriculum:get-syllabi-topic-quiz", args=[topic.slug]
+        ))
+
+    def test_quiz_body(self, user, enrolled_topic, logged_get):
+        data = self.get(user, enrolled_topic, logged_get).json()["data"]
+        assert [quiz["id"] for quiz in data["quiz"]] == list(
+            enrolled_topic.get_quizzes().values_list("id", flat=True)
+        )
+        assert all(len(quiz["options"]) == 3 for quiz in data["quiz"])
+        assert (data["mark"], data["completed"]) == (0, False)
+
+    def test_cached_quiz_body(
+        self, user, enrolled_topic, logged_get, django_assert_num_queries
+    ):
+        response = self.get(user, enrolled_topic, logged_get)
+
+        # The user lookup and the progress of the user are left
+        with django_assert_num_queries(2):
+            cached = self.get(user, enrolled_topic, logged_get)
+        assert cached.json() == response.json()
+
+    def test_user_overlay(
+        self, user, enrolled_topic, logged_get, submit_quiz
+    ):
+        self.get(user, enrolled_topic, logged_get)
+        submit_quiz(user, enrolled_topic)
+
+        data = self.get(user, enrolled_topic, logged_get).json()["data"]
+        assert (data["mark"], data["completed"]) == (100, True)
+        assert data["remaining_time"] > 0
+
+    def test_option_change_rebuilds_body(
+        self, user, enrolled_topic, logged_get,
+        django_capture_on_commit_callbacks
+    ):
+        self.get(user, enrolled_topic, logged_get)
+        option = QOption.objects.filter(quiz__topic=enrolled_topic).first()
+        with django_capture_on_commit_callbacks(execute=True):
+            option.option = "Changed option"
+            option.save()
+
+        data = self.get(user, enrolled_topic, logged_get).json()["data"]
+        assert "Changed option" in [
+            option["option"]
+            for quiz in data["quiz"] for option in quiz["options"]
+        ]
+
+    def test_deleted_topic(
+        self, user, enrolled_topic, logged_get,
+        django_capture_on_commit_callbacks
+    ):
+        self.get(user, enrolled_topic, logged_get)
+        with django_capture_on_commit_callbacks(execute=True):
+            enrolled_topic.delete()
+        assert self.get(user, enrolled_topic, logged_get).status_code == 404
+
+
+@pytest.mark.django_db
+class TestTopicPageCache:
+
+    @pytest.fixture
+    def topic(self, enrolled_topic):
+        enrolled_topic.resources.add(baker.make(Resource, rtype="A"))
+        return enrolled_topic
+
+    def get(self, user, topic, logged_get):
+        return logged_get(user, reverse(
+            "curriculum:get-syllabi-topic-progress", args=[topic.slug]
+        ))
+
+    def test_topic_page(self, user, topic, logged_get):
+        data = self.get(user, topic, logged_get).json()["data"]
+        assert (data["id"], data["completed"], data["quiz_mark"]) == (
+            None, False, 0
+        )
+        assert data["topic"]["id"] == topic.id
+        assert len(data["topic"]["resources"]) == 1
+        assert data["syllabi"]["id"] == topic.syllabi_id
+        assert len(data["syllabi"]["topics"]) == 3
+        assert len(data["syllabi"]["outlines"]) == 3
+
+    def test_cached_topic_page(
+        self, user, topic, logged_get, django_assert_num_queries
+    ):
+        response = self.get(user, topic, logged_get)
+
+        # The user lookup and the progress of the user are left
+        with django_assert_num_queries(2):
+            cached = self.get(user, topic, logged_get)
+        assert cached.json() == response.json()
+
+    def test_user_progress(self, user, topic, logged_get, submit_quiz):
+        self.get(user, topic, logged_get)
+        submit_quiz(user, topic)
+
+        data = self.get(user, topic, logged_get).json()["data"]
+        assert (data["completed"], data["quiz_mark"]) == (True, 100)
+        assert data["id"] is not None
+
+    @pytest.mark.parametrize("change", [
+        lambda topic: topic.resources.clear(),
+        lambda topic: topic.resources.first().syllabitopic_set.clear(),
+        lambda topic: topic.resources.first().delete(),
+    ])
+    def test_resource_change_rebuilds_page(
+        self, user, topic, logged_get, change,
+        django_capture_on_commit_callbacks
+    ):
+        self.get(user, topic, logged_get)
+        with django_capture_on_commit_callbacks(execute=True):
+            change(topic)
+
+        data = self.get(user, topic, logged_get).json()["data"]
+        assert data["topic"]["resources"] == []
+
+    def test_resource_saved(
+        self, user, topic, logged_get, django_capture_on_commit_callbacks
+    ):
+        self.get(user, topic, logged_get)
+        with django_capture_on_commit_callbacks(execute=True):
+            resource = topic.resources.first()
+            resource.name = "Changed name"
+            resource.save()
+
+        data = self.get(user, topic, logged_get).json()["data"]
+        assert data["topic"]["resources"][0]["name"] == "Changed name"
+
+    def test_topic_moved_to_other_curriculum(
+        self, user, curriculum, topic, make_curriculum, logged_get,
+        django_capture_on_commit_callbacks
+    ):
+        sibling = curriculum.syllabus.first().topics.last()
+        self.get(user, topic, logged_get)
+        self.get(user, sibling, logged_get)
+        with django_capture_on_commit_callbacks(execute=True):
+            topic.syllabi = make_curriculum(weeks=1).syllabus.first()
+            topic.save()
+
+        # Not enrolled in the curriculum of the topic anymore
+        assert self.get(user, topic, logged_get).status_code == 404
+        data = self.get(user, sibling, logged_get).json()["data"]
+        assert len(data["syllabi"]["topics"]) == 2
+
+    def test_not_enrolled(self, curriculum, logged_get, user_manager):
+        other = baker.make(user_manager.model, active=True)
+        topic = curriculum.syllabus.first().topics.first()
+        assert self.get(other, topic, logged_get).status_code == 404
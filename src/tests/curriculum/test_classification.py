@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum.classification import classify_reviews
+from Curriculum.models import CurriculumReview, ReviewClassificationJob
+from utils.base.date import dt_now
+
+
+def classify(text):
+    return "Positive", "Course Content"
+
+
+def fail(text):
+    raise ValueError("Model unavailable")
+
+
+@pytest.mark.django_db
+class TestReviewClassification:
+
+    @pytest.fixture
+    def review(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        return baker.make(
+            CurriculumReview, enrollment=enrollment, rating=4,
+            review="Great course",
+        )
+
+    def test_submit_enqueues_review(self, user, curriculum, logged_post):
+        user.enroll_curriculum(curriculum)
+        response = logged_post(user, reverse(
+            "curriculum:submit-review", args=[curriculum.slug]
+        ), {"rating": 5, "review": "Loved the exercises"})
+        assert response.status_code == 201
+
+        review = CurriculumReview.objects.get()
+        assert (review.sentiment, review.label) == (None, None)
+        job = ReviewClassificationJob.objects.get()
+        assert (job.review, job.status) == (review, job.PENDING)
+
+    def test_classify_reviews(
+        self, review, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(5):
+            assert classify_reviews(10, classify) == (1, 0)
+        review.refresh_from_db()
+        assert (review.sentiment, review.label) == ("P", "A")
+        assert not ReviewClassificationJob.objects.exists()
+        assert classify_reviews(10, classify) == (0, 0)
+
+    def retry_now(self):
+        ReviewClassificationJob.objects.update(next_attempt_at=dt_now())
+
+    def test_failed_classification(self, review, settings):
+        settings.REVIEW_CLASSIFICATION_MAX_ATTEMPTS = 2
+        job = ReviewClassificationJob.objects.get()
+        assert classify_reviews(10, fail) == (0, 1)
+        created_at = job.updated_at
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (job.PENDING, 1)
+        assert "Model unavailable" in job.error
+        assert job.updated_at > created_at
+
+        # Backed off until the retry delay passed
+        delay = job.next_attempt_at - job.updated_at
+        assert delay == timedelta(
+            seconds=settings.REVIEW_CLASSIFICATION_RETRY_DELAY
+        )
+        assert classify_reviews(10, fail) == (0, 0)
+
+        self.retry_now()
+        assert classify_reviews(10, fail) == (0, 1)
+        job.refresh_from_db()
+        assert (job.status, job.attempts) == (job.FAILED, 2)
+        self.retry_now()
+        assert classify_reviews(10, fail) == (0, 0)
+        review.refresh_from_db()
+        assert review.sentiment is None
+
+    def test_command(self, review):
+        out = StringIO()
+        call_command("classify_reviews", stdout=out)
+        assert "Classified 1 reviews" in out.getvalue()
+        review.refresh_from_db()
+        assert review.sentiment == "P"
+        assert review.label in CurriculumReview.LABEL_REV_LOOKUP.values()
+        assert not ReviewClassificationJob.objects.exists()
@@ -0,0 +1,158 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum import leaderboard
+from Curriculum.leaderboard import (BUCKETS, CURRICULUM, TOPIC,
+                                    build_histogram, get_histogram,
+                                    get_ready_key, get_standing, move_mark)
+from Curriculum.models import SyllabiProgress
+
+
+class TestStanding:
+
+    def test_standing(self):
+        histogram = [0] * BUCKETS
+        histogram[20], histogram[50], histogram[80] = 1, 2, 1
+        assert get_standing(histogram, 50) == {
+            "total": 4, "rank": 2, "percentile": 50.0
+        }
+        assert get_standing(histogram, 100) == {
+            "total": 4, "rank": 1, "percentile": 100.0
+        }
+        assert get_standing(histogram, None)["rank"] is None
+        assert get_standing([0] * BUCKETS, 10) == {
+            "total": 0, "rank": 1, "percentile": None
+        }
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+
+    def make_marks(self, topic, user_manager, marks):
+        for mark in marks:
+            enrollment = baker.make(user_manager.model).enroll_curriculum(
+                topic.syllabi.curriculum
+            )
+            baker.make(
+                SyllabiProgress, enrollment=enrollment, topic=topic,
+                syllabi=topic.syllabi, quiz_mark=mark,
+                last_attempted="2024-01-01T00:00:00Z",
+            )
+
+    def test_build_histogram(self, enrolled_topic, user_manager):
+        self.make_marks(enrolled_topic, user_manager, [20, 50, 50])
+        histogram = build_histogram(TOPIC, enrolled_topic.pk)
+        assert (histogram[20], histogram[50], sum(histogram)) == (1, 2, 3)
+        curriculum = build_histogram(
+            CURRICULUM, enrolled_topic.syllabi.curriculum_id
+        )
+        assert curriculum == histogram
+
+    def test_submissions_move_cached_marks(
+        self, user, enrolled_topic, submit_quiz, settings,
+        django_capture_on_commit_callbacks
+    ):
+        settings.TEST_INTERVAL_SECONDS = 0
+        get_histogram(TOPIC, enrolled_topic.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            submit_quiz(user, enrolled_topic)
+        assert get_histogram(TOPIC, enrolled_topic.pk)[100] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            submit_quiz(user, enrolled_topic, correct=False)
+        histogram = get_histogram(TOPIC, enrolled_topic.pk)
+        assert (histogram[100], histogram[50]) == (0, 1)
+        assert histogram == build_histogram(TOPIC, enrolled_topic.pk)
+        assert get_histogram(
+            CURRICULUM, enrolled_topic.syllabi.curriculum_id
+        ) == histogram
+
+    def test_topic_leaderboard(
+        self, user, enrolled_topic, user_manager, logged_get, submit_quiz
+    ):
+        self.make_marks(enrolled_topic, user_manager, [20, 50, 100])
+        submit_quiz(user, enrolled_topic, correct=False)
+        url = reverse(
+            "curriculum:get-topic-leaderboard", args=[enrolled_topic.slug]
+        )
+
+        data = logged_get(user, url).json()["data"]
+        assert (data["mark"], data["total"], data["rank"]) == (50, 4, 2)
+        assert data["percentile"] == 50.0
+        assert len(data["histogram"]) == BUCKETS
+
+        data = logged_get(user, url, {"mark": 10}).json()["data"]
+        assert (data["mark"], data["rank"], data["percentile"]) == (
+            10, 5, 0.0
+        )
+        assert logged_get(user, url, {"mark": 101}).status_code == 400
+
+    def test_cached_leaderboard(
+        self, user, enrolled_topic, logged_get, django_assert_num_queries
+    ):
+        url = reverse(
+            "curriculum:get-topic-leaderboard", args=[enrolled_topic.slug]
+        )
+        logged_get(user, url)
+
+        # The user, topic and user progress lookups are left
+        with django_assert_num_queries(3):
+            data = logged_get(user, url).json()["data"]
+        assert (data["mark"], data["rank"]) == (None, None)
+
+    def test_curriculum_leaderboard(
+        self, user, curriculum, enrolled_topic, logged_get, submit_quiz
+    ):
+        submit_quiz(user, enrolled_topic)
+        other = curriculum.syllabus.last().topics.first()
+        submit_quiz(user, other, correct=False)
+
+        data = logged_get(user, reverse(
+            "curriculum:get-curriculum-leaderboard", args=[curriculum.slug]
+        )).json()["data"]
+        assert (data["mark"], data["total"], data["rank"]) == (75, 1, 1)
+
+    def test_submissions_move_curriculum_average(
+        self, user, curriculum, enrolled_topic, submit_quiz, settings,
+        django_capture_on_commit_callbacks
+    ):
+        settings.TEST_INTERVAL_SECONDS = 0
+        get_histogram(CURRICULUM, curriculum.pk)
+        other = curriculum.syllabus.last().topics.first()
+        with django_capture_on_commit_callbacks(execute=True):
+            submit_quiz(user, enrolled_topic)
+        assert get_histogram(CURRICULUM, curriculum.pk)[100] == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            submit_quiz(user, other, correct=False)
+        histogram = get_histogram(CURRICULUM, curriculum.pk)
+        assert (histogram[100], histogram[75], sum(histogram)) == (0, 1, 1)
+        assert histogram == build_histogram(CURRICULUM, curriculum.pk)
+
+    def test_mark_moved_while_building(
+        self, enrolled_topic, user_manager, monkeypatch
+    ):
+        build = leaderboard.build_histogram
+
+        def concurrent_build(scope, pk):
+            histogram = build(scope, pk)
+            # A submission committing once the rows were read
+            move_mark(scope, pk, None, 40)
+            return histogram
+
+        monkeypatch.setattr(leaderboard, "build_histogram", concurrent_build)
+        get_histogram(TOPIC, enrolled_topic.pk)
+        assert cache.get(get_ready_key(TOPIC, enrolled_topic.pk)) is None
+
+        monkeypatch.setattr(leaderboard, "build_histogram", build)
+        self.make_marks(enrolled_topic, user_manager, [40])
+        assert get_histogram(TOPIC, enrolled_topic.pk)[40] == 1
+        assert cache.get(get_ready_key(TOPIC, enrolled_topic.pk))
+
+    def test_missing_topic(self, user, logged_get):
+        response = logged_get(user, reverse(
+            "curriculum:get-topic-leaderboard", args=["missing"]
+        ))
+        assert response.status_code == 404
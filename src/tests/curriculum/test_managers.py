@@ -0,0 +1,100 @@
+import pytest
+
+from Curriculum.models import CurriculumEnrollment, SyllabiProgress
+from Curriculum.progress import has_bit
+
+
+@pytest.mark.django_db
+class TestSyllabiProgressManager:
+
+    def test_get_or_default(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        topic = curriculum.syllabus.first().topics.first()
+
+        progress = SyllabiProgress.objects.get_or_default_by_user_and_topic(
+            user, topic.slug
+        )
+        assert progress.pk is None
+        assert (progress.enrollment, progress.topic) == (enrollment, topic)
+
+        created = SyllabiProgress.objects.get_or_default_by_user_and_topic(
+            user, topic.slug, create=True
+        )
+        assert created.pk is not None
+        assert SyllabiProgress.objects.get_or_default(
+            enrollment, topic
+        ) == created
+
+    def test_get_or_default_not_enrolled(self, user, curriculum):
+        topic = curriculum.syllabus.first().topics.first()
+        with pytest.raises(SyllabiProgress.DoesNotExist):
+            SyllabiProgress.objects.get_or_default_by_user_and_topic(
+                user, topic.slug, create=True
+            )
+
+    def test_get_curriculum_progress(
+        self, user, curriculum, django_assert_num_queries
+    ):
+        enrollment = user.enroll_curriculum(curriculum)
+        topic = curriculum.syllabus.last().topics.last()
+        created = SyllabiProgress.objects.create(
+            enrollment=enrollment, syllabi=topic.syllabi, topic=topic
+        )
+        curriculum = type(curriculum).objects.prefetch_related(
+            "curriculumsyllabi_set__syllabitopic_set"
+        ).get(pk=curriculum.pk)
+
+        with django_assert_num_queries(1):
+            rows = SyllabiProgress.objects.get_curriculum_progress(
+                enrollment, curriculum
+            )
+        assert [row.topic for row in rows] == [
+            topic for syllabi in curriculum.syllabus
+            for topic in syllabi.topics
+        ]
+        assert [row.pk for row in rows] == [None] * 5 + [created.pk]
+
+
+@pytest.mark.django_db
+class TestCurriculumEnrollmentManager:
+
+    def test_set_topic_completed(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        enrollments = CurriculumEnrollment.objects.filter(pk=enrollment.pk)
+
+        enrollments.set_topic_completed(9, True)
+        enrollments.set_topic_completed(2, True)
+        enrollments.set_topic_completed(9, False)
+        enrollment.refresh_from_db()
+
+        bitmap = bytes(enrollment.completed_bitmap)
+        assert [has_bit(bitmap, position) for position in (2, 9)] == [
+            True, False
+        ]
+        assert (enrollment.completed_topics, enrollment.progress) == (1, 16)
+
+    def test_set_topic_completed_twice(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        enrollments = CurriculumEnrollment.objects.filter(pk=enrollment.pk)
+
+        for position, completed in ((2, True), (2, True), (4, False)):
+            enrollments.set_topic_completed(position, completed)
+            enrollment.refresh_from_db()
+            assert enrollment.completed_topics == 1
+
+    def test_stale_progress_saves(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        topic = curriculum.syllabus.first().topics.first()
+        SyllabiProgress.objects.create(
+            enrollment=enrollment, syllabi=topic.syllabi, topic=topic
+        )
+
+        first, second = [
+            SyllabiProgress.objects.get(topic=topic) for _ in range(2)
+        ]
+        for progress in (first, second):
+            progress.completed = True
+            progress.save()
+        enrollment.refresh_from_db()
+        assert (enrollment.completed_topics, enrollment.progress) == (1, 16)
+        assert enrollment.is_topic_completed(topic)
@@ -0,0 +1,142 @@
+from io import StringIO
+
+import pytest
+from django.contrib.admin import ModelAdmin
+from django.core.management import call_command
+from model_bakery import baker
+
+from Curriculum.admin import CurriculumAdmin
+from Curriculum.models import (Curriculum, CurriculumEnrollment,
+                               CurriculumSyllabi, SyllabiTopic)
+
+
+@pytest.mark.django_db
+class TestCurriculumCounters:
+
+    def counters(self, curriculum):
+        curriculum.refresh_from_db()
+        return curriculum.weeks_count, curriculum.topics_count
+
+    def test_counters_follow_structure(self, make_curriculum):
+        curriculum = make_curriculum(weeks=2, topics=3, quizzes=0)
+        assert self.counters(curriculum) == (2, 6)
+
+        syllabi = curriculum.syllabus.first()
+        syllabi.topics.first().delete()
+        assert self.counters(curriculum) == (2, 5)
+
+        syllabi.delete()
+        assert self.counters(curriculum) == (1, 3)
+
+    def test_stale_save_keeps_counters(self):
+        curriculum = baker.make(Curriculum, difficulty="B")
+        syllabi = baker.make(CurriculumSyllabi, curriculum=curriculum)
+        baker.make(SyllabiTopic, syllabi=syllabi)
+
+        curriculum.name = "Renamed"
+        curriculum.save()
+        assert self.counters(curriculum) == (1, 1)
+        assert curriculum.name == "Renamed"
+
+    def test_backfill_command(self, make_curriculum):
+        curriculum = make_curriculum(weeks=3, topics=2, quizzes=0)
+        Curriculum.objects.update(weeks_count=0, topics_count=10)
+
+        call_command("backfill_curriculum_counters", stdout=StringIO())
+        assert self.counters(curriculum) == (3, 6)
+
+    def test_counters_not_in_admin_form(self, rf, admin_site):
+        form = CurriculumAdmin(Curriculum, admin_site).get_form(rf.get("/"))
+        assert not set(Curriculum.counter_fields) & set(form.base_fields)
+
+    def test_enrolled_counter(
+        self, curriculum, user_manager, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            enrollments = [
+                baker.make(user_manager.model).enroll_curriculum(curriculum)
+                for _ in range(3)
+            ]
+        with django_capture_on_commit_callbacks(execute=True):
+            enrollments[0].delete()
+        curriculum.refresh_from_db()
+        assert curriculum.enrolled == 2
+
+        Curriculum.objects.update(enrolled=0)
+        call_command("backfill_curriculum_counters", stdout=StringIO())
+        curriculum.refresh_from_db()
+        assert curriculum.enrolled == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("eager_progress")
+class TestEnrollmentCounters:
+
+    def counters(self, enrollment):
+        enrollment.refresh_from_db()
+        return (
+            enrollment.completed_topics, enrollment.total_topics,
+            enrollment.progress
+        )
+
+    def complete(self, enrollment, count, completed=True):
+        for progress in enrollment.syllabiprogress_set\
+                .filter(completed=not completed)[:count]:
+            progress.completed = completed
+            progress.save()
+
+    def test_counters_follow_progress(self, user, make_curriculum):
+        curriculum = make_curriculum(weeks=2, topics=2, quizzes=0)
+        enrollment = user.enroll_curriculum(curriculum)
+        assert self.counters(enrollment) == (0, 4, 0)
+
+        self.complete(enrollment, 3)
+        assert self.counters(enrollment) == (3, 4, 75)
+
+        # Saving again without flipping does not count twice
+        progress = enrollment.syllabiprogress_set.filter(completed=True)[0]
+        progress.quiz_mark = 90
+        progress.save()
+        assert self.counters(enrollment) == (3, 4, 75)
+
+        self.complete(enrollment, 1, completed=False)
+        assert self.counters(enrollment) == (2, 4, 50)
+
+    def test_counters_follow_topics(self, user, make_curriculum):
+        curriculum = make_curriculum(weeks=2, topics=2, quizzes=0)
+        enrollment = user.enroll_curriculum(curriculum)
+        self.complete(enrollment, 2)
+
+        syllabi = curriculum.syllabus.first()
+        baker.make(SyllabiTopic, syllabi=syllabi)
+        assert self.counters(enrollment) == (2, 5, 40)
+
+        completed = enrollment.syllabiprogress_set.filter(completed=True)
+        completed.first().topic.delete()
+        assert self.counters(enrollment) == (1, 4, 25)
+
+    def test_counters_not_in_admin_form(self, rf, admin_site):
+        form = ModelAdmin(CurriculumEnrollment, admin_site)\
+            .get_form(rf.get("/"))
+        assert not set(CurriculumEnrollment.counter_fields) & set(
+            form.base_fields
+        )
+
+    def test_stale_enrollment_save(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        stale = CurriculumEnrollment.objects.get(pk=enrollment.pk)
+        self.complete(enrollment, 3)
+
+        stale.completed = True
+        stale.save()
+        assert self.counters(enrollment) == (3, 6, 50)
+
+    def test_backfill_command(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        enrollment.syllabiprogress_set.filter(
+            syllabi=curriculum.syllabus.first()
+        ).update(completed=True)
+        CurriculumEnrollment.objects.update(total_topics=0, progress=3)
+
+        call_command("backfill_curriculum_counters", stdout=StringIO())
+        assert self.counters(enrollment) == (3, 6, 50)
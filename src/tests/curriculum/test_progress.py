@@ -0,0 +1,319 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum.models import (CurriculumEnrollment, SyllabiProgress,
+                               SyllabiTopic)
+from Curriculum.progress import (has_bit, rebuild_completion_bitmaps,
+                                 set_bit)
+from Curriculum.throttle import get_throttle_hits
+from tests.conftest import get_answers
+
+
+@pytest.mark.django_db
+class TestSparseProgress:
+
+    @pytest.fixture
+    def enrollment(self, user, curriculum):
+        return user.enroll_curriculum(curriculum)
+
+    def test_get_quiz_creates_no_row(
+        self, user, curriculum, enrollment, logged_get
+    ):
+        topic = curriculum.syllabus.first().topics.first()
+        response = logged_get(user, reverse(
+            "curriculum:get-syllabi-topic-quiz", args=[topic.slug]
+        ))
+
+        data = response.json()["data"]
+        assert (data["mark"], data["completed"]) == (0, False)
+        assert not SyllabiProgress.objects.exists()
+
+    def test_submit_creates_row(
+        self, user, curriculum, enrollment, submit_quiz
+    ):
+        topic = curriculum.syllabus.first().topics.first()
+        response = submit_quiz(user, topic)
+        assert response.json()["data"]["mark"] == 100
+
+        progress = SyllabiProgress.objects.get()
+        assert (progress.topic, progress.syllabi) == (topic, topic.syllabi)
+        assert progress.completed
+
+        enrollment.refresh_from_db()
+        assert (enrollment.completed_topics, enrollment.progress) == (1, 16)
+
+    def test_not_enrolled(self, user, curriculum, logged_get, submit_quiz):
+        topic = curriculum.syllabus.first().topics.first()
+        response = logged_get(user, reverse(
+            "curriculum:get-syllabi-topic-quiz", args=[topic.slug]
+        ))
+        assert response.status_code == 404
+        assert submit_quiz(user, topic).status_code == 404
+
+    def test_reads_fill_defaults(
+        self, user, curriculum, enrollment, logged_get, submit_quiz,
+        settings
+    ):
+        settings.TEST_INTERVAL_SECONDS = 0
+        first = curriculum.syllabus.first()
+        for topic in first.topics:
+            submit_quiz(user, topic)
+
+        syllabus = logged_get(user, reverse(
+            "curriculum:get-enrolled-curriculum", args=[curriculum.slug]
+        )).json()["data"]["syllabus"]
+        assert [syllabi["completed"] for syllabi in syllabus] == [
+            True, False
+        ]
+
+        grades = logged_get(user, reverse(
+            "curriculum:get-curriculum-grades", args=[curriculum.slug]
+        )).json()["data"]
+        assert [
+            syllabi["completed"]
+            for syllabi in grades["curriculum"]["syllabus"]
+        ] == [True, False]
+        progress = grades["progress"]
+        assert len(progress) == 6
+        assert [row["completed"] for row in progress] == [True] * 3 + \
+            [False] * 3
+        assert [row["id"] is None for row in progress] == [False] * 3 + \
+            [True] * 3
+
+        topic = curriculum.syllabus.last().topics.first()
+        data = logged_get(user, reverse(
+            "curriculum:get-syllabi-topic-progress", args=[topic.slug]
+        )).json()["data"]
+        assert (data["completed"], data["quiz_mark"]) == (False, 0)
+        assert data["topic"]["id"] == topic.id
+
+
+class TestBitmap:
+
+    def test_set_bit(self):
+        bitmap = set_bit(b"", 10)
+        assert bitmap == b"\x00\x04"
+        assert has_bit(bitmap, 10)
+        assert not has_bit(bitmap, 9)
+        assert not has_bit(bitmap, 100)
+        assert set_bit(bitmap, 10, False) == b"\x00\x00"
+        assert set_bit(b"", 30, False) == b""
+
+
+@pytest.mark.django_db
+class TestCompletionBitmap:
+
+    def complete(self, enrollment, topics):
+        for topic in topics:
+            progress = SyllabiProgress.objects.get_or_default(
+                enrollment, topic
+            )
+            progress.completed = True
+            progress.save()
+        enrollment.refresh_from_db()
+
+    def test_topic_positions(self, make_curriculum):
+        curriculum = make_curriculum(weeks=2, topics=2, quizzes=0)
+        topics = SyllabiTopic.objects.filter(syllabi__curriculum=curriculum)
+        assert sorted(topics.values_list("position", flat=True)) == [
+            0, 1, 2, 3
+        ]
+
+        # Positions of deleted topics are not reused
+        topics.order_by("position").last().delete()
+        topic = baker.make(SyllabiTopic, syllabi=curriculum.syllabus.first())
+        assert topic.position == 4
+
+    def test_completion(
+        self, user, make_curriculum, django_assert_num_queries
+    ):
+        curriculum = make_curriculum(weeks=3, topics=2, quizzes=0)
+        enrollment = user.enroll_curriculum(curriculum)
+        first, second, third = curriculum.syllabus
+        self.complete(enrollment, [*first.topics, second.topics.first()])
+
+        assert enrollment.is_topic_completed(first.topics.first())
+        assert not enrollment.is_topic_completed(second.topics.last())
+        with django_assert_num_queries(1):
+            assert enrollment.get_syllabus_completion() == {
+                first.id: True, second.id: False, third.id: False
+            }
+        assert enrollment.completed_weeks == 1
+
+        # A topic added to a completed week makes it incomplete
+        baker.make(SyllabiTopic, syllabi=first)
+        assert enrollment.completed_weeks == 0
+
+    def test_uncomplete_and_delete(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        first = curriculum.syllabus.first()
+        self.complete(enrollment, first.topics)
+        assert enrollment.completed_weeks == 1
+
+        progress = enrollment.syllabiprogress_set.first()
+        progress.completed = False
+        progress.save()
+        enrollment.refresh_from_db()
+        assert enrollment.completed_weeks == 0
+
+        self.complete(enrollment, [progress.topic])
+        enrollment.syllabiprogress_set.get(topic=progress.topic).delete()
+        enrollment.refresh_from_db()
+        assert not enrollment.is_topic_completed(progress.topic)
+        assert enrollment.completed_topics == 2
+
+    def test_created_completed(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        first, second = curriculum.syllabus.first().topics[:2]
+        SyllabiProgress.objects.create(
+            enrollment=enrollment, syllabi=first.syllabi, topic=first,
+            completed=True,
+        )
+        SyllabiProgress.objects.get_or_create(
+            enrollment=enrollment, topic=second,
+            defaults={"syllabi": second.syllabi, "completed": True},
+        )
+        enrollment.refresh_from_db()
+        assert enrollment.completed_topics == 2
+        assert enrollment.is_topic_completed(first)
+        assert enrollment.is_topic_completed(second)
+
+    def test_enrolled_list(self, user, make_curriculum, logged_get):
+        for weeks in (1, 2, 3):
+            curriculum = make_curriculum(weeks=weeks, topics=2, quizzes=0)
+            enrollment = user.enroll_curriculum(curriculum)
+            self.complete(enrollment, curriculum.syllabus.first().topics)
+
+        results = logged_get(
+            user, reverse("curriculum:get-enrolled-curriculums")
+        ).json()["data"]["results"]
+        assert [row["completed_weeks"] for row in results] == [1, 1, 1]
+        assert "completed_bitmap" not in results[0]
+
+    def test_backfill_command(self, user, curriculum):
+        enrollment = user.enroll_curriculum(curriculum)
+        self.complete(enrollment, curriculum.syllabus.first().topics)
+        CurriculumEnrollment.objects.update(completed_bitmap=b"")
+
+        call_command("backfill_curriculum_counters", stdout=StringIO())
+        enrollment.refresh_from_db()
+        assert enrollment.completed_weeks == 1
+
+    def test_rebuild_bitmaps_in_chunks(self, user_manager, curriculum):
+        topics = curriculum.syllabus.first().topics.all()
+        enrollments = [
+            baker.make(user_manager.model).enroll_curriculum(curriculum)
+            for _ in range(3)
+        ]
+        for enrollment in enrollments[1:]:
+            self.complete(enrollment, topics)
+        bitmap = bytes(enrollments[1].completed_bitmap)
+        CurriculumEnrollment.objects.filter(
+            pk=enrollments[2].pk
+        ).update(completed_bitmap=b"")
+
+        assert rebuild_completion_bitmaps(
+            CurriculumEnrollment, SyllabiProgress, chunk_size=2
+        ) == 1
+        assert [
+            bytes(enrollment.completed_bitmap) for enrollment in
+            CurriculumEnrollment.objects.order_by("pk")
+        ] == [b"", bitmap, bitmap]
+
+
+@pytest.mark.django_db
+class TestSubmitTopicQuiz:
+
+    def test_grading(self, user, curriculum, submit_quiz):
+        user.enroll_curriculum(curriculum)
+        topic = curriculum.syllabus.first().topics.first()
+        answers = get_answers(topic)
+        first, second = topic.get_quizzes()
+        answers[str(second.id)] = str(
+            second.get_options().filter(is_correct=False).first().id
+        )
+
+        data = submit_quiz(user, topic, answers).json()["data"]
+        assert data["mark"] == 50
+        assert [
+            list(quiz.values())[0]["is_correct"] for quiz in data["quiz"]
+        ] == [True, False]
+
+    @pytest.mark.parametrize("answers", [
+        lambda first, other: {},
+        lambda first, other: {str(first.id): "x"},
+        # Option of another question of the topic
+        lambda first, other: {
+            str(first.id): str(other.get_options().first().id)
+        },
+        lambda first, other: {"0": str(first.get_options().first().id)},
+    ])
+    def test_invalid_answers(self, user, curriculum, submit_quiz, answers):
+        enrollment = user.enroll_curriculum(curriculum)
+        topic = curriculum.syllabus.first().topics.first()
+        first, other = topic.get_quizzes()
+
+        response = submit_quiz(user, topic, answers(first, other))
+        assert response.status_code == 400
+        assert not enrollment.syllabiprogress_set.exists()
+
+    def test_queries_constant(self, user, make_curriculum, submit_quiz):
+        def count(quizzes):
+            curriculum = make_curriculum(weeks=1, topics=1, quizzes=quizzes)
+            user.enroll_curriculum(curriculum)
+            topic = curriculum.syllabus.first().topics.first()
+            answers = get_answers(topic)
+            with CaptureQueriesContext(connection) as context:
+                response = submit_quiz(user, topic, answers)
+            assert response.json()["data"]["mark"] == 100
+            return len(context.captured_queries)
+
+        assert count(2) == count(20)
+
+
+@pytest.mark.django_db
+class TestRetakeThrottle:
+
+    def test_cached_retake(
+        self, user, enrolled_topic, submit_quiz, django_assert_num_queries
+    ):
+        answers = get_answers(enrolled_topic)
+        assert submit_quiz(user, enrolled_topic).status_code == 200
+
+        # Only the user lookup of the permission class is left
+        with django_assert_num_queries(1):
+            response = submit_quiz(user, enrolled_topic, answers)
+        assert response.status_code == 400
+        assert get_throttle_hits() == {"cache": 1, "db": 0}
+
+    def test_retake_on_cache_miss(self, user, enrolled_topic, submit_quiz):
+        submit_quiz(user, enrolled_topic)
+        cache.clear()
+
+        assert submit_quiz(user, enrolled_topic).status_code == 400
+        assert submit_quiz(user, enrolled_topic).status_code == 400
+        assert get_throttle_hits() == {"cache": 1, "db": 1}
+
+    def test_retake_allowed(
+        self, user, enrolled_topic, submit_quiz, settings
+    ):
+        settings.TEST_INTERVAL_SECONDS = 0
+        submit_quiz(user, enrolled_topic)
+        assert submit_quiz(user, enrolled_topic).status_code == 200
+        assert get_throttle_hits() == {"cache": 0, "db": 0}
+
+    def test_stats_command(self, user, enrolled_topic, submit_quiz):
+        submit_quiz(user, enrolled_topic)
+        submit_quiz(user, enrolled_topic)
+
+        out = StringIO()
+        call_command("quiz_throttle_stats", "--reset", stdout=out)
+        assert "cache: 1" in out.getvalue()
+        assert get_throttle_hits() == {"cache": 0, "db": 0}
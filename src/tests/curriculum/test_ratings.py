@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from model_bakery import baker
+
+from Curriculum.admin import CurriculumAdmin
+from Curriculum.api.base.serializers import CurriculumSerializer
+from Curriculum.models import Curriculum, CurriculumReview
+
+
+@pytest.mark.django_db
+class TestCurriculumRatings:
+
+    @pytest.fixture
+    def enrollments(self, curriculum, user_manager):
+        return [
+            baker.make(user_manager.model).enroll_curriculum(curriculum)
+            for _ in range(3)
+        ]
+
+    def review(self, enrollment, rating):
+        return baker.make(
+            CurriculumReview, enrollment=enrollment, rating=rating
+        )
+
+    def get_counters(self, curriculum):
+        curriculum.refresh_from_db()
+        return (
+            curriculum.ratings, curriculum.rating, curriculum.get_stars()
+        )
+
+    def test_review_created(self, curriculum, enrollments):
+        for enrollment, rating in zip(enrollments, [5, 4, 4]):
+            self.review(enrollment, rating)
+        ratings, rating, stars = self.get_counters(curriculum)
+        assert (ratings, round(rating, 2), stars) == (
+            3, 4.33, [0, 0, 0, 2, 1]
+        )
+        data = CurriculumSerializer(curriculum).data
+        assert data["stars"] == stars
+        assert "rating_total" not in data
+
+    def test_review_changed(self, curriculum, enrollments):
+        review = self.review(enrollments[0], 5)
+        self.review(enrollments[1], 3)
+
+        review.rating = 1
+        review.save()
+        assert self.get_counters(curriculum) == (2, 2.0, [1, 0, 1, 0, 0])
+
+        review.review = "Same rating"
+        review.save()
+        assert self.get_counters(curriculum) == (2, 2.0, [1, 0, 1, 0, 0])
+
+    def test_review_deleted(self, curriculum, enrollments):
+        review = self.review(enrollments[0], 5)
+        self.review(enrollments[1], 2)
+
+        review.delete()
+        assert self.get_counters(curriculum) == (1, 2.0, [0, 1, 0, 0, 0])
+        enrollments[1].delete()
+        assert self.get_counters(curriculum) == (0, 0.0, [0] * 5)
+
+    def test_curriculum_save_keeps_counters(self, curriculum, enrollments):
+        stale = Curriculum.objects.get(pk=curriculum.pk)
+        self.review(enrollments[0], 4)
+        stale.name = "Changed name"
+        stale.save()
+        assert self.get_counters(curriculum) == (1, 4.0, [0, 0, 0, 1, 0])
+
+    def test_reconcile_command(
+        self, curriculum, make_curriculum, enrollments
+    ):
+        other = make_curriculum(quizzes=0)
+        for enrollment, rating in zip(enrollments, [5, 4, 1]):
+            self.review(enrollment, rating)
+        Curriculum.objects.update(
+            ratings=10, rating=1.0, rating_total=3, stars_5=0
+        )
+
+        out = StringIO()
+        call_command(
+            "reconcile_curriculum_ratings", "--batch-size", "1", stdout=out
+        )
+        assert "Recounted 2 curriculums" in out.getvalue()
+        assert self.get_counters(curriculum) == (
+            3, 10 / 3, [1, 0, 0, 1, 1]
+        )
+        assert self.get_counters(other) == (0, 0.0, [0] * 5)
+
+    def test_counters_not_in_admin_form(self, rf, admin_site):
+        form = CurriculumAdmin(Curriculum, admin_site).get_form(rf.get("/"))
+        assert not {"rating", "ratings"} & set(form.base_fields)
@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum.models import (Curriculum, CurriculumSearch,
+                               CurriculumSyllabi, SyllabiTopic)
+from Curriculum.search import (build_search_documents, install_search_index,
+                               search_curriculums)
+
+
+@pytest.mark.django_db
+class TestCurriculumSearch:
+
+    @pytest.fixture(autouse=True)
+    def search_index(self):
+        install_search_index()
+
+    @pytest.fixture
+    def curriculums(self):
+        by_name = baker.make(
+            Curriculum, name="Python Basics", difficulty="B",
+            description="Start coding", objective="Write scripts",
+        )
+        by_summary = baker.make(
+            Curriculum, name="Backend Development", difficulty="I",
+            description="Build APIs with Python", objective="Ship APIs",
+        )
+        by_topic = baker.make(
+            Curriculum, name="Data Analysis", difficulty="A",
+            description="Explore datasets", objective="Find insights",
+        )
+        syllabi = baker.make(
+            CurriculumSyllabi, curriculum=by_topic,
+            title="Tooling", description="Notebooks and libraries",
+        )
+        baker.make(
+            SyllabiTopic, syllabi=syllabi,
+            title="Pandas with python", description="Dataframes",
+        )
+        baker.make(Curriculum, name="Design Systems", difficulty="B")
+        build_search_documents()
+        return [by_name, by_summary, by_topic]
+
+    def search(self, text):
+        return list(search_curriculums(Curriculum.objects.all(), text))
+
+    def test_ranked_across_documents(self, curriculums):
+        assert self.search("python") == curriculums
+
+    def test_prefix_and_operators(self, curriculums):
+        assert self.search("pyth") == curriculums
+        assert self.search('python" OR (design') == []
+        assert self.search("+-*") == []
+
+    def test_document_follows_topic_changes(
+        self, curriculums, django_capture_on_commit_callbacks
+    ):
+        topic = SyllabiTopic.objects.get(title="Pandas with python")
+        with django_capture_on_commit_callbacks(execute=True):
+            topic.title = "Pandas with numpy"
+            topic.save()
+        assert self.search("numpy") == curriculums[2:]
+        assert self.search("python") == curriculums[:2]
+
+    def test_one_rebuild_per_transaction(
+        self, curriculums, django_capture_on_commit_callbacks
+    ):
+        syllabi = CurriculumSyllabi.objects.get(title="Tooling")
+        table = CurriculumSearch._meta.db_table
+        with CaptureQueriesContext(connection) as context:
+            with django_capture_on_commit_callbacks(execute=True):
+                for title in ("Numpy arrays", "Plotting", "Statistics"):
+                    baker.make(SyllabiTopic, syllabi=syllabi, title=title)
+                curriculums[0].name = "Python Scripting"
+                curriculums[0].save()
+        rebuilds = [
+            query for query in context.captured_queries
+            if query["sql"].startswith(f'DELETE FROM "{table}"')
+        ]
+        assert len(rebuilds) == 1
+        assert self.search("plotting") == curriculums[2:]
+        assert self.search("scripting") == curriculums[:1]
+
+    def test_deleted_curriculum_leaves_index(
+        self, curriculums, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            curriculums[2].delete()
+        assert self.search("python") == curriculums[:2]
+
+    def test_list_search(self, user, curriculums, logged_get):
+        response = logged_get(
+            user, reverse("curriculum:list-curriculum"), {"search": "python"}
+        )
+        names = [
+            curriculum["name"]
+            for curriculum in response.json()["data"]["results"]
+        ]
+        assert names == [curriculum.name for curriculum in curriculums]
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from utils.base.mixins import StreamingListMixin
+
+
+def count_queries(func) -> int:
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestEnrolledCurriculumViews:
+
+    @pytest.mark.parametrize("name", [
+        "curriculum:get-enrolled-curriculum",
+        "curriculum:get-curriculum-resources",
+        "curriculum:get-curriculum-grades",
+    ])
+    def test_syllabus_queries_constant(
+        self, name, user, make_curriculum, logged_get
+    ):
+        def request(weeks):
+            curriculum = make_curriculum(weeks=weeks, quizzes=0)
+            user.enroll_curriculum(curriculum)
+            url = reverse(name, args=[curriculum.slug])
+            return lambda: logged_get(user, url)
+
+        small, large = request(2), request(6)
+        assert count_queries(small) == count_queries(large)
+
+    @pytest.mark.usefixtures("eager_progress")
+    def test_enrolled_curriculum_completed(
+        self, user, curriculum, logged_get
+    ):
+        enrollment = user.enroll_curriculum(curriculum)
+        first = curriculum.syllabus.first()
+        for progress in enrollment.syllabiprogress_set.filter(syllabi=first):
+            progress.completed = True
+            progress.save()
+
+        response = logged_get(user, reverse(
+            "curriculum:get-enrolled-curriculum", args=[curriculum.slug]
+        ))
+        syllabus = response.json()["data"]["syllabus"]
+        assert [syllabi["completed"] for syllabi in syllabus] == [
+            True, False
+        ]
+        assert len(syllabus[0]["topics"]) == 3
+
+
+@pytest.mark.django_db
+class TestCurriculumListViews:
+
+    def test_list_queries_constant(
+        self, user, make_curriculum, logged_get
+    ):
+        url = reverse("curriculum:list-curriculum")
+        make_curriculum(weeks=1, quizzes=0)
+        few = count_queries(lambda: logged_get(user, url))
+        for _ in range(3):
+            make_curriculum(weeks=2, quizzes=0)
+        assert count_queries(lambda: logged_get(user, url)) == few
+
+        weeks = [
+            curriculum["weeks"] for curriculum in
+            logged_get(user, url).json()["data"]["results"]
+        ]
+        assert sorted(weeks) == [1, 2, 2, 2]
+
+    def test_enrolled_list_queries_constant(
+        self, user, make_curriculum, logged_get
+    ):
+        url = reverse("curriculum:get-enrolled-curriculums")
+        user.enroll_curriculum(make_curriculum(weeks=1, quizzes=0))
+        few = count_queries(lambda: logged_get(user, url))
+        for _ in range(3):
+            user.enroll_curriculum(make_curriculum(weeks=2, quizzes=0))
+        assert count_queries(lambda: logged_get(user, url)) == few
+
+    @pytest.mark.parametrize("name", [
+        "curriculum:list-curriculum",
+        "curriculum:get-enrolled-curriculums",
+    ])
+    def test_list_streaming(
+        self, name, user, make_curriculum, logged_get, monkeypatch
+    ):
+        monkeypatch.setattr(StreamingListMixin, "stream_chunk_size", 2)
+        for _ in range(5):
+            user.enroll_curriculum(make_curriculum(weeks=1, quizzes=0))
+        url = reverse(name)
+        paginated = logged_get(user, url).json()["data"]["results"]
+
+        response = logged_get(user, url + "?stream=true")
+        assert response.streaming
+        data = json.loads(b"".join(response.streaming_content))
+        assert data["success"] is True
+        assert data["path"] == url
+        assert sorted(data["data"], key=str) == \
+            sorted(paginated, key=str)
@@ -0,0 +1,155 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from Curriculum.models import CurriculumEnrollment, SyllabiTopic
+from RoadMap.models import Roadmap, RoadmapCurriculum, RoadmapEnrollment
+from RoadMap.progress import get_weighted_progress
+
+
+def make_roadmap(*curriculums):
+    roadmap = baker.make(Roadmap)
+    for order, (curriculum, rtype) in enumerate(curriculums):
+        baker.make(
+            RoadmapCurriculum, roadmap=roadmap, curriculum=curriculum,
+            rtype=rtype, order=order
+        )
+    return roadmap
+
+
+def complete_topic(enrollment, topic):
+    CurriculumEnrollment.objects.filter(pk=enrollment.pk)\
+        .set_topic_completed(topic.position, True)
+
+
+class TestWeightedProgress:
+
+    def test_weighted_progress(self, settings):
+        settings.ROADMAP_PROGRESS_WEIGHTS = {"R": 2, "E": 1}
+        assert get_weighted_progress([]) == 0
+        assert get_weighted_progress([("R", 50), ("E", 20)]) == 40
+        assert get_weighted_progress([("E", 100), ("X", 0)]) == 100
+
+
+@pytest.mark.django_db
+class TestRoadmapProgress:
+
+    @pytest.fixture(autouse=True)
+    def weights(self, settings):
+        settings.ROADMAP_PROGRESS_WEIGHTS = {"R": 2, "E": 1}
+
+    @pytest.fixture
+    def required(self, make_curriculum):
+        return make_curriculum(quizzes=0)
+
+    @pytest.fixture
+    def elective(self, make_curriculum):
+        return make_curriculum(weeks=1, topics=2, quizzes=0)
+
+    @pytest.fixture
+    def roadmap(self, required, elective):
+        return make_roadmap((required, "R"), (elective, "E"))
+
+    def get_progress(self, user, roadmap) -> int:
+        return RoadmapEnrollment.objects.get(
+            user=user, roadmap=roadmap
+        ).progress
+
+    def test_topic_completed(self, user, required, elective, roadmap):
+        enrollment = user.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+
+        complete_topic(enrollment, required.syllabus.first().topics.first())
+        # (2 * 16 + 0) / 3
+        assert self.get_progress(user, roadmap) == 10
+
+        enrollment = user.enroll_curriculum(elective)
+        complete_topic(enrollment, elective.syllabus.first().topics.first())
+        # (2 * 16 + 50) / 3
+        assert self.get_progress(user, roadmap) == 27
+
+    def test_enrolled_with_progress(self, user, required, roadmap):
+        enrollment = user.enroll_curriculum(required)
+        for topic in required.syllabus.first().topics:
+            complete_topic(enrollment, topic)
+
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+        assert self.get_progress(user, roadmap) == 33
+
+    def test_topic_added(self, user, required, roadmap):
+        enrollment = user.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+        for topic in required.syllabus.first().topics:
+            complete_topic(enrollment, topic)
+        assert self.get_progress(user, roadmap) == 33
+
+        for _ in range(6):
+            baker.make(SyllabiTopic, syllabi=required.syllabus.first())
+        # (2 * 25 + 0) / 3
+        assert self.get_progress(user, roadmap) == 16
+
+    def test_roadmap_curriculum_changed(
+        self, user, required, elective, roadmap
+    ):
+        enrollment = user.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+        for syllabi in required.syllabus:
+            for topic in syllabi.topics:
+                complete_topic(enrollment, topic)
+        assert self.get_progress(user, roadmap) == 66
+
+        RoadmapCurriculum.objects.get(curriculum=elective).delete()
+        assert self.get_progress(user, roadmap) == 100
+
+    def test_curriculum_unenrolled(self, user, required, roadmap):
+        enrollment = user.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+        complete_topic(enrollment, required.syllabus.first().topics.first())
+        assert self.get_progress(user, roadmap) == 10
+
+        enrollment.delete()
+        assert self.get_progress(user, roadmap) == 0
+
+    def test_other_users_unchanged(
+        self, user, user_manager, required, roadmap
+    ):
+        other = baker.make(user_manager.model)
+        other.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=other, roadmap=roadmap)
+
+        enrollment = user.enroll_curriculum(required)
+        complete_topic(enrollment, required.syllabus.first().topics.first())
+        assert self.get_progress(other, roadmap) == 0
+
+    def test_queries_bounded(self, user, required, elective):
+        enrollment = user.enroll_curriculum(required)
+        topics = iter(SyllabiTopic.objects.filter(
+            syllabi__curriculum=required
+        ))
+
+        def count(roadmaps):
+            for _ in range(roadmaps):
+                roadmap = make_roadmap((required, "R"), (elective, "E"))
+                baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+            with CaptureQueriesContext(connection) as context:
+                complete_topic(enrollment, next(topics))
+            return len(context.captured_queries)
+
+        assert count(1) == count(5)
+
+    def test_recompute_command(self, user, required, roadmap):
+        enrollment = user.enroll_curriculum(required)
+        baker.make(RoadmapEnrollment, user=user, roadmap=roadmap)
+        complete_topic(enrollment, required.syllabus.first().topics.first())
+        RoadmapEnrollment.objects.update(progress=0)
+
+        out = StringIO()
+        call_command(
+            "recompute_roadmap_progress", "--batch-size", "1", stdout=out
+        )
+        assert "Updated 1 roadmap enrollments" in out.getvalue()
+        assert self.get_progress(user, roadmap) == 10
@@ -0,0 +1,85 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from model_bakery import baker
+
+from RoadMap.cache import get_graph_key
+from RoadMap.models import JobRole, Roadmap, RoadmapCurriculum
+
+
+@pytest.fixture
+def roadmap(make_curriculum):
+    roadmap = baker.make(Roadmap, job_role=baker.make(JobRole))
+    for order, rtype in enumerate(["E", "R", "R"]):
+        baker.make(
+            RoadmapCurriculum, roadmap=roadmap, rtype=rtype,
+            order=order, curriculum=make_curriculum(quizzes=0),
+        )
+    return roadmap
+
+
+def url(roadmap):
+    return reverse("roadmap:get-roadmap", args=[roadmap.pk])
+
+
+@pytest.mark.django_db
+class TestRoadmapViews:
+
+    def test_roadmap_graph(self, user, roadmap, logged_get):
+        data = logged_get(user, url(roadmap)).json()["data"]
+        assert data["job_role"]["id"] == roadmap.job_role_id
+        assert [item["order"] for item in data["required"]] == [1, 2]
+        assert [item["order"] for item in data["electives"]] == [0]
+        assert data["required"][0]["curriculum"]["weeks"] == 2
+        assert data["stats"] == {
+            "required": 2, "electives": 1, "weeks": 4, "topics": 12
+        }
+
+    def test_graph_is_cached(
+        self, user, roadmap, logged_get, django_assert_num_queries
+    ):
+        response = logged_get(user, url(roadmap))
+        assert cache.get(get_graph_key(roadmap.pk)) is not None
+
+        # Only the user lookup of the permission class is left
+        with django_assert_num_queries(1):
+            cached = logged_get(user, url(roadmap))
+        assert cached.json() == response.json()
+
+    def test_curriculum_change_invalidates_graph(
+        self, user, roadmap, logged_get, make_curriculum,
+        django_capture_on_commit_callbacks
+    ):
+        logged_get(user, url(roadmap))
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(
+                RoadmapCurriculum, roadmap=roadmap, rtype="R", order=3,
+                curriculum=make_curriculum(weeks=1, quizzes=0),
+            )
+        assert cache.get(get_graph_key(roadmap.pk)) is None
+
+        data = logged_get(user, url(roadmap)).json()["data"]
+        assert data["stats"]["required"] == 3
+        assert data["stats"]["weeks"] == 5
+
+    def test_curriculum_saved_invalidates_graph(
+        self, user, roadmap, logged_get, django_capture_on_commit_callbacks
+    ):
+        logged_get(user, url(roadmap))
+        curriculum = roadmap.get_curriculums().first().curriculum
+        with django_capture_on_commit_callbacks(execute=True):
+            curriculum.name = "Changed name"
+            curriculum.save()
+
+        data = logged_get(user, url(roadmap)).json()["data"]
+        assert data["electives"][0]["curriculum"]["name"] == "Changed name"
+
+    def test_missing_roadmap(self, user, logged_get):
+        response = logged_get(user, reverse("roadmap:get-roadmap", args=[0]))
+        assert response.status_code == 404
+
+    def test_roadmap_list(self, user, roadmap, logged_get):
+        data = logged_get(user, reverse("roadmap:list-roadmap")).json()
+        assert [
+            item["id"] for item in data["data"]["results"]
+        ] == [roadmap.pk]
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from Curriculum.models import Curriculum
+from utils.base.counters import CounterBuffer, write_counts
+
+
+def get_enrolled(*curriculums):
+    return [
+        Curriculum.objects.values_list("enrolled", flat=True).get(pk=cur.pk)
+        for cur in curriculums
+    ]
+
+
+@pytest.mark.django_db
+class TestCounterBuffer:
+
+    @pytest.fixture
+    def curriculums(self):
+        return baker.make(Curriculum, difficulty="B", _quantity=3)
+
+    def test_write_counts(self, curriculums):
+        first, second, third = curriculums
+        with CaptureQueriesContext(connection) as context:
+            updated = write_counts(Curriculum, "enrolled", {
+                first.pk: 2, second.pk: 2, third.pk: 5
+            })
+        assert updated == 3
+        # One UPDATE for each distinct amount
+        assert len(context.captured_queries) == 2
+        assert get_enrolled(*curriculums) == [2, 2, 5]
+
+    def test_buffered_increments(self, curriculums):
+        first, second, _ = curriculums
+        buffer = CounterBuffer(flush_interval=60, max_pending=10)
+        for _ in range(3):
+            buffer.increment(Curriculum, "enrolled", first.pk)
+        buffer.increment(Curriculum, "enrolled", second.pk, -1)
+        assert get_enrolled(first, second) == [0, 0]
+
+        assert buffer.flush() == 2
+        assert get_enrolled(first, second) == [3, -1]
+        assert buffer.flush() == 0
+
+    def test_flush_when_due(self, curriculums):
+        buffer = CounterBuffer(flush_interval=60, max_pending=2)
+        buffer.increment(Curriculum, "enrolled", curriculums[0].pk)
+        buffer.increment(Curriculum, "enrolled", curriculums[0].pk)
+        assert get_enrolled(curriculums[0]) == [0]
+
+        buffer.increment(Curriculum, "enrolled", curriculums[1].pk)
+        assert get_enrolled(*curriculums[:2]) == [2, 1]
+
+        buffer = CounterBuffer(flush_interval=0, max_pending=10)
+        buffer.increment(Curriculum, "enrolled", curriculums[2].pk)
+        assert get_enrolled(curriculums[2]) == [1]
+
+    def test_failed_flush_keeps_increments(self, curriculums):
+        buffer = CounterBuffer(flush_interval=60, max_pending=10)
+        buffer.increment(Curriculum, "enrolled", curriculums[0].pk)
+        buffer.increment(Curriculum, "missing_field", curriculums[0].pk)
+        with pytest.raises(Exception):
+            buffer.flush()
+        assert get_enrolled(curriculums[0]) == [0]
+
+        buffer._pending.pop((Curriculum, "missing_field"))
+        assert buffer.flush() == 1
+        assert get_enrolled(curriculums[0]) == [1]
+
+    def test_failed_flush_on_increment(self, curriculums):
+        buffer = CounterBuffer(flush_interval=0, max_pending=10)
+        # Logged and kept pending instead of failing the caller
+        buffer.increment(Curriculum, "missing_field", curriculums[0].pk)
+        assert buffer._size == 1
+
+    def test_flush_hooks(self, curriculums):
+        first, second, _ = curriculums
+        buffer = CounterBuffer(flush_interval=60, max_pending=10)
+        flushed = []
+        buffer.on_flush(Curriculum)(flushed.append)
+        buffer.increment(Curriculum, "enrolled", second.pk)
+        buffer.increment(Curriculum, "enrolled", first.pk)
+        buffer.flush()
+        assert flushed == [sorted([first.pk, second.pk])]
+
+        # Nothing pending, nothing written
+        assert buffer.flush() == 0
+        assert len(flushed) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_timer_flushes_idle_buffer():
+    curriculum = baker.make(Curriculum, difficulty="B")
+    buffer = CounterBuffer(flush_interval=0.05, max_pending=10)
+    buffer.increment(Curriculum, "enrolled", curriculum.pk)
+    assert get_enrolled(curriculum) == [0]
+
+    deadline = time.monotonic() + 5
+    while get_enrolled(curriculum) == [0] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert get_enrolled(curriculum) == [1]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_increments():
+    curriculums = baker.make(Curriculum, difficulty="B", _quantity=2)
+    buffer = CounterBuffer(flush_interval=60, max_pending=1000)
+    done = threading.Event()
+
+    def increment():
+        for index in range(200):
+            curriculum = curriculums[index % 2]
+            buffer.increment(Curriculum, "enrolled", curriculum.pk)
+
+    def flush():
+        # Flush while the increments are made, from its own connection
+        while not done.is_set():
+            buffer.flush()
+        connection.close()
+
+    flusher = threading.Thread(target=flush)
+    flusher.start()
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    flusher.join()
+
+    buffer.flush()
+    assert get_enrolled(*curriculums) == [800, 800]
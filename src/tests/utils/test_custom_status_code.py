@@ -1,4 +1,4 @@
-from utils.base.status import StatCode
+from utils.base.status import STATUS_MESSAGES, CustomStatusCode, StatCode
 
 
 class TestCustomStatusCode:
@@ -48,3 +48,10 @@ class TestCustomStatusCode:
 
     def test_http_440_invalid_signature(self):
         assert self.code.HTTP_440_INVALID_SIGNATURE == 440
+
+    def test_status_messages(self):
+        assert STATUS_MESSAGES['200'] == \
+            CustomStatusCode.HTTP_200_OK.__doc__
+        assert STATUS_MESSAGES['442'] == \
+            CustomStatusCode.HTTP_442_BAD_PAYMENT_REQUEST.__doc__
+        assert STATUS_MESSAGES.get('500') is None
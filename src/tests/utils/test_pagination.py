@@ -0,0 +1,105 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from Curriculum.models import CurriculumReview
+
+
+def get_page(logged_get, user, url):
+    data = logged_get(user, url).json()["data"]
+    return [item["id"] for item in data["results"]], data
+
+
+@pytest.fixture
+def reviews(user, curriculum):
+    enrollment = user.enroll_curriculum(curriculum)
+    reviews = baker.make(
+        CurriculumReview, enrollment=enrollment, rating=4, _quantity=7
+    )
+    # Make ties on created_at to check the id tie breaker
+    first = reviews[0].created_at
+    CurriculumReview.objects.filter(
+        pk__in=[review.pk for review in reviews[:4]]
+    ).update(created_at=first)
+    return CurriculumReview.objects.order_by("-created_at", "-id")
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    def test_review_pages(self, user, curriculum, reviews, logged_get):
+        expected = list(reviews.values_list("id", flat=True))
+        url = reverse(
+            "curriculum:list-curriculum-reviews", args=[curriculum.slug]
+        ) + "?page_size=3"
+
+        seen, data = get_page(logged_get, user, url)
+        assert data["previous"] is None
+        pages = [seen]
+        while data["next"]:
+            ids, data = get_page(logged_get, user, data["next"])
+            pages.append(ids)
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == expected
+
+        backwards = []
+        while data["previous"]:
+            ids, data = get_page(logged_get, user, data["previous"])
+            backwards.append(ids)
+        assert backwards == pages[-2::-1]
+
+    def test_no_count_query(self, user, curriculum, reviews, logged_get):
+        url = reverse(
+            "curriculum:list-curriculum-reviews", args=[curriculum.slug]
+        ) + "?page_size=2"
+        _, data = get_page(logged_get, user, url)
+
+        with CaptureQueriesContext(connection) as context:
+            get_page(logged_get, user, data["next"])
+        assert not any(
+            "COUNT(" in query["sql"].upper()
+            for query in context.captured_queries
+        )
+
+    def test_invalid_cursor(self, user, curriculum, logged_get):
+        url = reverse(
+            "curriculum:list-curriculum-reviews", args=[curriculum.slug]
+        )
+        response = logged_get(user, url + "?cursor=bad")
+        assert response.status_code == 404
+
+    def test_selected_by_query_param(
+        self, user, make_curriculum, logged_get
+    ):
+        created = [make_curriculum(weeks=1, quizzes=0) for _ in range(3)]
+        url = reverse("curriculum:list-curriculum")
+
+        _, data = get_page(logged_get, user, url)
+        assert "count" in data
+
+        ids, data = get_page(
+            logged_get, user, url + "?pagination=cursor&page_size=2"
+        )
+        assert "count" not in data
+        ids += get_page(logged_get, user, data["next"])[0]
+        assert ids == [curriculum.id for curriculum in created]
+
+    def test_enrolled_curriculums(
+        self, user, make_curriculum, logged_get
+    ):
+        enrollments = [
+            user.enroll_curriculum(make_curriculum(weeks=1, quizzes=0))
+            for _ in range(3)
+        ]
+        url = reverse("curriculum:get-enrolled-curriculums")
+        _, data = get_page(
+            logged_get, user, url + "?pagination=cursor&page_size=2"
+        )
+        results = data["results"]
+        results += logged_get(user, data["next"])\
+            .json()["data"]["results"]
+        assert [item["curriculum"]["id"] for item in results] == [
+            enrollment.curriculum_id for enrollment in enrollments
+        ]
@@ -1,5 +1,6 @@
 import json
-from utils.base.renderer import ApiRenderer
+from utils.base.renderer import (ApiRenderer, EncodedJSON, encode_json,
+                                 stream_envelope)
 from django.test import RequestFactory
 
 from utils.base.renderer import ResponseDecorator
@@ -75,3 +76,37 @@ class TestApiRenderer:
             }
         )
         assert result is not None
+
+
+class TestEncodedRender:
+    def render(self, data, status_code=200, message=None):
+        response = Response(data, status_code)
+        response.message = message
+        return ApiRenderer().render(
+            data, renderer_context={
+                'request': RequestFactory().get('/path/'),
+                'response': response,
+            }
+        )
+
+    def test_same_as_render(self):
+        data = {'name': 'test', 'items': [1, 2.5, None, 'ü ']}
+        for status_code, message in [(200, None), (404, 'missing')]:
+            encoded = self.render(
+                encode_json(data), status_code, message
+            )
+            assert encoded == self.render(data, status_code, message)
+
+    def test_data_not_encoded_again(self):
+        computed = self.render(EncodedJSON(b'{"a":[1,2]}'))
+        assert json.loads(computed)["data"] == {"a": [1, 2]}
+        assert json.loads(computed)["path"] == "/path/"
+
+    def test_stream_envelope(self):
+        request = RequestFactory().get('/path/')
+        chunks = [[{'id': 1}, {'id': 2}], [], [{'id': 3}]]
+        streamed = b''.join(stream_envelope(request, iter(chunks)))
+        assert streamed == self.render([{'id': 1}, {'id': 2}, {'id': 3}])
+        assert json.loads(
+            b''.join(stream_envelope(request, iter([])))
+        )["data"] == []
@@ -0,0 +1,47 @@
+"""
+Version counters of cached entries.
+
+Entries are stored along with the version they were built under, a
+bumped version makes every entry built before the change stale
+without having to find and delete them.
+"""
+
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def get_version(key: str) -> int:
+    """
+    Get the version stored under `key`, a missing version starts from
+    the clock so it never matches an entry built before the version
+    was evicted.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+def bump_versions(keys: Iterable[str]):
+    """
+    Bump the versions once the current transaction commits, so a
+    concurrent read can not store an entry built before the change
+    under the new version.
+    """
+    keys = list(set(keys))
+
+    def bump():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Nothing was cached under a missing version
+                pass
+
+    if keys:
+        transaction.on_commit(bump)
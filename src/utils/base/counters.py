@@ -0,0 +1,203 @@
+"""
+Write-behind buffer of counter columns.
+
+Hot counters like the enrollments of a popular curriculum would have
+every request contend on the same row if each increment was written
+on its own. Increments are added up in the process instead and
+written every few seconds, with one UPDATE for each counter column and
+amount, e.g. `UPDATE ... SET enrolled = enrolled + 3 WHERE id IN (...)`.
+Pending increments are flushed from a timer thread of the process
+and when it exits, they are only lost if it is killed, so the buffer
+is only meant for counters that can be recounted. A recount has to run
+once the buffers of the running processes are flushed, or their
+pending increments are counted twice.
+"""
+
+import atexit
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple, Type
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import close_old_connections, models, transaction
+from django.db.models import F
+from django.dispatch import receiver
+
+from utils.base.logger import err_logger
+
+# (Model, field) => pk => amount
+Pending = Dict[Tuple[Type[models.Model], str], Dict[int, int]]
+# Called with the pks of the flushed rows of a model
+FlushHook = Callable[[List[int]], None]
+
+
+def write_counts(
+    model: Type[models.Model], field: str, counts: Dict[int, int]
+) -> int:
+    """
+    Add the amounts to the counter column of the rows, with one
+    UPDATE for each distinct amount
+
+    :param counts: Row pk => amount
+    :return: Number of updated rows
+    :rtype: int
+    """
+    pks = defaultdict(list)
+    for pk, amount in counts.items():
+        if amount:
+            pks[amount].append(pk)
+    return sum(
+        model._default_manager.filter(pk__in=amount_pks).update(
+            **{field: F(field) + amount}
+        )
+        for amount, amount_pks in pks.items()
+    )
+
+
+class CounterBuffer:
+    """
+    Buffer of counter increments flushed once `flush_interval` seconds
+    passed since the last flush, or once `max_pending` rows have
+    pending increments. A zero interval writes every increment
+    right away.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Pending = defaultdict(lambda: defaultdict(int))
+        self._size = 0
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        self._hooks: Dict[Type[models.Model], List[FlushHook]] = \
+            defaultdict(list)
+        self._timer_pid = None
+
+    def on_flush(self, model: Type[models.Model]):
+        """
+        Register a function called with the pks of the flushed rows of
+        `model`, in the transaction of the flush
+        """
+        def decorator(hook: FlushHook) -> FlushHook:
+            self._hooks[model].append(hook)
+            return hook
+        return decorator
+
+    def start_timer(self):
+        """
+        Start the thread flushing the buffer every `flush_interval`
+        seconds, once in each process so forked workers get their own
+        """
+        if self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._timer_pid == os.getpid():
+                return
+            self._timer_pid = os.getpid()
+        threading.Thread(
+            target=self._run_timer, name="counter-flush", daemon=True
+        ).start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if not self.is_due():
+                continue
+            try:
+                self.flush_if_due()
+            finally:
+                close_old_connections()
+
+    def increment(
+        self, model: Type[models.Model], field: str, pk: int,
+        amount: int = 1
+    ):
+        with self._lock:
+            counts = self._pending[(model, field)]
+            if pk not in counts:
+                self._size += 1
+            counts[pk] += amount
+        self.start_timer()
+        self.flush_if_due()
+
+    def is_due(self) -> bool:
+        return bool(self._size) and (
+            self._size >= self.max_pending
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        )
+
+    def flush_if_due(self) -> int:
+        """
+        Flush the buffer when due. A failed flush is logged and its
+        increments are kept for the next one, so it never fails the
+        request or commit hook that triggered it.
+        """
+        if not self.is_due():
+            return 0
+        try:
+            return self.flush()
+        except Exception:
+            err_logger.exception("Failed to flush counters")
+            return 0
+
+    def flush(self) -> int:
+        """
+        Write the pending increments in one transaction, increments
+        made while writing are kept for the next flush and the pending
+        increments are put back if the writes or hooks fail.
+
+        :return: Number of updated rows
+        :rtype: int
+        """
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(
+                lambda: defaultdict(int)
+            )
+            self._size = 0
+            self._flushed_at = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            with transaction.atomic():
+                updated = 0
+                flushed = defaultdict(set)
+                for (model, field), counts in pending.items():
+                    updated += write_counts(model, field, counts)
+                    flushed[model].update(counts)
+                for model, pks in flushed.items():
+                    for hook in self._hooks[model]:
+                        hook(sorted(pks))
+                return updated
+        except Exception:
+            self.restore(pending)
+            raise
+
+    def restore(self, pending: Pending):
+        with self._lock:
+            for key, counts in pending.items():
+                for pk, amount in counts.items():
+                    if pk not in self._pending[key]:
+                        self._size += 1
+                    self._pending[key][pk] += amount
+
+
+counters = CounterBuffer(
+    settings.COUNTER_FLUSH_INTERVAL, settings.COUNTER_MAX_PENDING
+)
+
+
+@receiver(request_finished)
+def flush_counters(sender, **kwargs):
+    counters.flush_if_due()
+
+
+@atexit.register
+def flush_counters_at_exit():
+    try:
+        counters.flush()
+    except Exception:
+        err_logger.exception("Failed to flush counters at exit")
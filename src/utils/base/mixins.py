@@ -7,8 +7,11 @@ from typing import Callable, List, Iterable
 from django.contrib import admin
 from django.db import models
 from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
 from rest_framework import mixins, viewsets
 from rest_framework.response import Response
+from utils.base.pagination import KeysetPagination
+from utils.base.renderer import stream_envelope
 
 
 class ModelChangeFunc(models.Model):
@@ -61,7 +64,10 @@ class ModelChangeFunc(models.Model):
             function(self)
 
     def save(self, force_insert=False, force_update=False, *args, **kwargs):
-        super().save(force_insert, force_update, *args, **kwargs)
+        super().save(
+            *args, force_insert=force_insert, force_update=force_update,
+            **kwargs
+        )
 
         for field in self.monitor_change_fields:
             clone_field = self.get_clone_field(field)
@@ -82,6 +88,34 @@ class ModelChangeFunc(models.Model):
             setattr(self, clone_field, default_value)
 
 
+class CounterFieldsModel(models.Model):
+    """
+    Abstract model for counter columns that are only changed with
+    F expression updates.
+
+    counter_fields: tuple = (field, ...)
+        A full save of an already stored instance leaves these
+        fields out, so a stale instance can not overwrite them.
+    """
+
+    class Meta:
+        abstract = True
+
+    counter_fields: tuple = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            self.counter_fields and not self._state.adding
+            and kwargs.get("update_fields") is None
+        ):
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
 class UpdateRetrieveViewSet(
     mixins.UpdateModelMixin,
     mixins.RetrieveModelMixin,
@@ -112,6 +146,71 @@ class ListMixinUtils(object):
         return Response(serializer.data)
 
 
+class KeysetPaginationMixin(object):
+    """
+    Let a list view switch to keyset pagination on `keyset_ordering`
+    when the request asks for it with `?pagination=cursor`, or follows
+    a cursor link. Other requests keep the view's pagination class.
+    """
+    keyset_ordering: tuple = ("id",)
+    keyset_query_param = "pagination"
+
+    def use_keyset_pagination(self) -> bool:
+        request = getattr(self, "request", None)
+        if request is None:
+            return False
+        params = request.query_params
+        return (
+            params.get(self.keyset_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.pagination_class is None:
+                self._paginator = None
+            elif self.use_keyset_pagination():
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+class StreamingListMixin(object):
+    """
+    Let a list view stream all of its results with `?stream=true`.
+    The queryset is read with an iterator and serialized and encoded
+    `stream_chunk_size` items at a time, in the usual envelope.
+    """
+    stream_chunk_size = 100
+    stream_query_param = "stream"
+
+    def use_streaming(self) -> bool:
+        value = self.request.query_params.get(self.stream_query_param, "")
+        return value.lower() in ("1", "true")
+
+    def get_stream_chunks(self, queryset: QuerySet):
+        chunk = []
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(instance)
+            if len(chunk) == self.stream_chunk_size:
+                yield self.get_serializer(chunk, many=True).data
+                chunk = []
+        if chunk:
+            yield self.get_serializer(chunk, many=True).data
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_streaming():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            stream_envelope(request, self.get_stream_chunks(queryset)),
+            content_type="application/json"
+        )
+
+
 class ExtraAdminUtils(admin.ModelAdmin):
     add_fieldsets: dict = None
     add_form = None
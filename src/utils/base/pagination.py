@@ -1,7 +1,131 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (Cursor, CursorPagination,
+                                       PageNumberPagination)
 
 
 class CustomPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 1000
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on a stable, unique tuple of keys such as
+    ("id",) or ("-created_at", "-id"), read from `view.keyset_ordering`.
+
+    The cursor holds the keys of the last row seen and the next page
+    is fetched with a row comparison on them, with no COUNT or OFFSET,
+    so a deep page costs the same as the first one. The keys must not
+    be nullable and the last one should be unique.
+    """
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    ordering = ('id',)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [reverse_key(key) for key in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            position = self.decode_position(self.cursor.position)
+            queryset = queryset.filter(
+                get_keyset_filter(ordering, position)
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def decode_position(self, position):
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or \
+                len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_position(self, instance):
+        values = [
+            get_key_value(instance, key) for key in self.ordering
+        ]
+        return json.dumps(values, default=str)
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=False,
+            position=self.get_position(self.page[-1])
+        ))
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0, reverse=True,
+            position=self.get_position(self.page[0])
+        ))
+
+
+def reverse_key(key: str) -> str:
+    return key[1:] if key.startswith('-') else f'-{key}'
+
+
+def get_key_value(instance, key: str):
+    value = instance
+    for attr in key.lstrip('-').split('__'):
+        value = getattr(value, attr)
+    return value
+
+
+def get_keyset_filter(ordering, values) -> Q:
+    """
+    Build the row comparison `(a, b) > (x, y)` for the ordering keys,
+    following the direction of each key.
+    """
+    conditions = []
+    for index, key in enumerate(ordering):
+        field = key.lstrip('-')
+        lookup = 'lt' if key.startswith('-') else 'gt'
+        equal = {
+            previous.lstrip('-'): value
+            for previous, value in zip(ordering[:index], values)
+        }
+        conditions.append(
+            Q(**equal, **{f'{field}__{lookup}': values[index]})
+        )
+    return reduce(or_, conditions)
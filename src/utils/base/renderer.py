@@ -1,9 +1,35 @@
-from typing import Type
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple
 
 from rest_framework.renderers import (INDENT_SEPARATORS, LONG_SEPARATORS,
                                       SHORT_SEPARATORS, JSONRenderer)
 from rest_framework.utils import json
-from utils.base.status import CustomStatusCode
+from utils.base.status import STATUS_MESSAGES
+
+DATA_PLACEHOLDER = "__encoded_data__"
+PATH_PLACEHOLDER = "__encoded_path__"
+
+
+class EncodedJSON(bytes):
+    """
+    Already encoded JSON for the `data` of a response, ApiRenderer
+    places it into the envelope as it is, without encoding it again.
+    """
+
+
+def encode_json(data) -> EncodedJSON:
+    """
+    Encode `data` the way ApiRenderer does, to be stored (e.g. in the
+    cache) and returned later as the data of a Response.
+    """
+    renderer = ApiRenderer()
+    ret = json.dumps(
+        data, cls=renderer.encoder_class,
+        ensure_ascii=renderer.ensure_ascii,
+        allow_nan=not renderer.strict, separators=SHORT_SEPARATORS
+    )
+    ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+    return EncodedJSON(ret.encode())
 
 
 class ResponseDecorator:
@@ -38,11 +64,7 @@ class ResponseDecorator:
             self.set_message()
 
     def set_message(self):
-        for key, value in CustomStatusCode.__dict__.items():
-            if key.find(self.status) != -1:
-                stat_obj_property: Type[property] = value
-                self.message = stat_obj_property.__doc__
-                break
+        self.message = STATUS_MESSAGES.get(self.status)
 
     def get_response(self) -> dict:
         """
@@ -87,7 +109,59 @@ class ResponseDecorator:
         }
 
 
+@lru_cache(maxsize=256)
+def get_envelope_template(
+    status: str, message: str, separators: Tuple[str, str],
+    ensure_ascii: bool
+) -> Tuple[bytes, bytes, bytes]:
+    """
+    Encode the envelope of a status once, split around the
+    data and path values.
+
+    :return: The parts before the data, between data and path
+        and after the path
+    :rtype: Tuple[bytes, bytes, bytes]
+    """
+    envelope = ResponseDecorator(
+        status=status, data=DATA_PLACEHOLDER, message=message
+    ).get_response()
+    envelope["path"] = PATH_PLACEHOLDER
+    ret = json.dumps(
+        envelope, ensure_ascii=ensure_ascii, separators=separators
+    )
+    head, _, tail = ret.partition(json.dumps(DATA_PLACEHOLDER))
+    middle, _, end = tail.partition(json.dumps(PATH_PLACEHOLDER))
+    return head.encode(), middle.encode(), end.encode()
+
+
 class ApiRenderer(JSONRenderer):
+    def get_separators(self, accepted_media_type, renderer_context):
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is None:
+            return SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+        return INDENT_SEPARATORS
+
+    def render_encoded(
+        self, response, request, accepted_media_type,
+        renderer_context: dict
+    ) -> bytes:
+        """
+        Join the already encoded data into the encoded envelope
+        of the response status.
+        """
+        head, middle, end = get_envelope_template(
+            str(response.status_code),
+            getattr(response, 'message', None),
+            self.get_separators(accepted_media_type, renderer_context),
+            self.ensure_ascii
+        )
+        path = request.META['PATH_INFO'] if request is not None else ''
+        return b''.join((
+            head, response.data, middle,
+            json.dumps(path, ensure_ascii=self.ensure_ascii).encode(),
+            end
+        ))
+
     def render(
         self, data, accepted_media_type=None,
         renderer_context: dict = None
@@ -101,6 +175,10 @@ class ApiRenderer(JSONRenderer):
         # Customize the response
         request = renderer_context.get('request')
         response = renderer_context.get('response')
+        if isinstance(response.data, EncodedJSON):
+            return self.render_encoded(
+                response, request, accepted_media_type, renderer_context
+            )
         data_kwargs = {
             'request': request,
             'status': response.status_code,
@@ -128,3 +206,33 @@ class ApiRenderer(JSONRenderer):
         # See: http://timelessrepo.com/json-isnt-a-javascript-subset
         ret = ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
         return ret.encode()
+
+
+def stream_envelope(
+    request, chunks: Iterable[list], status: int = 200,
+    message: str = None
+) -> Iterator[bytes]:
+    """
+    Encode the response envelope with a list as its data, one chunk
+    of items at a time, so the whole list is never held in memory.
+
+    :param chunks: Lists of already serialized items
+    :type chunks: Iterable[list]
+    """
+    head, middle, end = get_envelope_template(
+        str(status), message, SHORT_SEPARATORS, ApiRenderer.ensure_ascii
+    )
+    path = request.META['PATH_INFO'] if request is not None else ''
+
+    yield head + b'['
+    separator = b''
+    for chunk in chunks:
+        if chunk:
+            # Drop the brackets of the encoded list to join the items
+            yield separator + encode_json(chunk)[1:-1]
+            separator = b','
+    yield b''.join((
+        b']', middle,
+        json.dumps(path, ensure_ascii=ApiRenderer.ensure_ascii).encode(),
+        end
+    ))
@@ -2,6 +2,9 @@
 Descriptive HTTP status codes, for code api readability.
 """
 
+from types import MappingProxyType
+from typing import Mapping
+
 
 class CustomStatusCode(object):
     @property
@@ -92,3 +95,18 @@ class CustomStatusCode(object):
 
 
 StatCode = CustomStatusCode()
+
+
+def get_status_messages() -> Mapping[str, str]:
+    """
+    Map each status code of CustomStatusCode, e.g. '200',
+    to the docstring of its property.
+    """
+    messages = {}
+    for key, value in CustomStatusCode.__dict__.items():
+        if isinstance(value, property) and key.startswith('HTTP_'):
+            messages.setdefault(key.split('_')[1], value.__doc__)
+    return MappingProxyType(messages)
+
+
+STATUS_MESSAGES = get_status_messages()
@@ -0,0 +1,72 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.response import Response
+
+from utils.base.renderer import ApiRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark ApiRenderer.render throughput on a small payload "
+        "and on a large curriculum list payload"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=2.0)
+        parser.add_argument("--items", type=int, default=1000)
+
+    def get_payloads(self, items: int):
+        curriculum = {
+            "id": 1,
+            "weeks": 10,
+            "name": "Backend engineering with Django",
+            "slug": "backend-engineering-with-django",
+            "description": "Build and ship web services " * 10,
+            "objective": "Design, test and deploy an api " * 5,
+            "prerequisites": "Python basics",
+            "enrolled": 1200,
+            "difficulty": "I",
+            "rating": 4.5,
+            "ratings": 300,
+            "created_at": "2024-01-01T10:00:00Z",
+        }
+        return {
+            "small": {"id": 1, "name": "test"},
+            "large": {
+                "next": None,
+                "previous": None,
+                "count": items,
+                "results": [
+                    {**curriculum, "id": index} for index in range(items)
+                ],
+            },
+        }
+
+    def measure(self, renderer, context, seconds: float):
+        calls = 0
+        start = perf_counter()
+        while perf_counter() - start < seconds:
+            renderer.render(
+                context["response"].data, renderer_context=context
+            )
+            calls += 1
+        return calls / (perf_counter() - start)
+
+    def handle(self, *args, **options):
+        renderer = ApiRenderer()
+        request = RequestFactory().get("/api/v1/curriculum/")
+        payloads = self.get_payloads(options["items"])
+        for name, data in payloads.items():
+            for status in (200, 404):
+                context = {
+                    "request": request,
+                    "response": Response(data, status=status),
+                }
+                rate = self.measure(renderer, context, options["seconds"])
+                self.stdout.write(
+                    f"{name} payload, status {status}: "
+                    f"{rate:,.0f} renders/s "
+                    f"({1_000_000 / rate:,.1f}us per render)"
+                )